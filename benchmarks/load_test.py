@@ -0,0 +1,413 @@
+"""
+HTTP load benchmark for the events API.
+
+Seeds a local database, starts ``backend.app.main:app`` with uvicorn and
+drives request mixes against it, then writes a JSON report with req/s and
+latency percentiles per route, so numbers can be compared between commits.
+
+    python benchmarks/load_test.py --events 1000 --registrations 1000000 \\
+        --duration 30 --concurrency 64 --output bench.json
+
+    python benchmarks/load_test.py --baseline bench-main.json --output bench.json
+
+By default it runs against a throwaway SQLite file (DB_ENGINE=sqlite); use
+``--engine postgresql`` to run against the database configured in ``.env``
+(it must be empty to be seeded; ``--no-seed`` keeps its current data).
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+# Pesos das operações em cada cenário
+SCENARIOS = {
+    # Muitos votos ao mesmo tempo, concentrados em poucas ideias
+    "vote_burst": {"vote": 0.9, "poll_registered": 0.05, "poll_unique": 0.05},
+    # Reruns do Streamlit: só listagens
+    "polling": {"poll_registered": 0.5, "poll_unique": 0.4, "ranking": 0.1},
+    "mixed": {
+        "vote": 0.2,
+        "poll_registered": 0.35,
+        "poll_unique": 0.35,
+        "ranking": 0.1,
+    },
+}
+
+ROUTES = {
+    "vote": "POST /eventos/{event_id}/participants",
+    "poll_registered": "GET /eventos/registered/",
+    "poll_unique": "GET /eventos/participants/unique",
+    "ranking": "GET /eventos/ranking",
+}
+
+
+# ==================== SEED ====================
+
+
+def seed_database(
+    events: int, registrations: int, votes_per_participant: int, batch: int = 50_000
+) -> None:
+    """
+    Create the schema and fill it with ``events`` ideas and ``registrations``
+    votes, ``votes_per_participant`` distinct ideas per participant.
+    """
+    sys.path.insert(0, str(SRC))
+    from backend.app.engine_database.migrations import run_migrations
+    from backend.app.schemas import Base
+    from backend.app.schemas import (  # noqa: F401
+        SchemaEventParticipants,
+        SchemaEvents,
+        SchemaEventVoteTally,
+        SchemaRegisteredEvents,
+    )
+    from backend.app.utils.ConnectionDatabaseSql import ConnectionDatabase
+    from backend.app.utils.NormalizeText import normalize_text
+    from backend.app.utils.SqlStatementRegistry import sql_statements
+    from sqlalchemy import text
+
+    connection = ConnectionDatabase(base=Base, async_mode=False)
+    engine = connection.connect()
+    connection.create_schema(migrate=run_migrations)
+
+    votes_per_participant = max(1, min(votes_per_participant, events))
+    # Mesmo formato do CURRENT_TIMESTAMP, aceito pelos dois bancos
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO events (id_event, event_name, event_name_normalized, "
+                "create_date, update_date) VALUES (:id, :name, :normalized, :now, :now)"
+            ),
+            [
+                {
+                    "id": i,
+                    "name": f"Ideia de evento {i}",
+                    "normalized": normalize_text(f"Ideia de evento {i}"),
+                    "now": now,
+                }
+                for i in range(1, events + 1)
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO registered_events (id_event, event_name, created_by, "
+                "created_date) VALUES (:id, :name, :created_by, :now)"
+            ),
+            [
+                {
+                    "id": i,
+                    "name": f"Ideia de evento {i}",
+                    "created_by": f"Participante {i}",
+                    "now": now,
+                }
+                for i in range(1, events + 1)
+            ],
+        )
+
+    insert_vote = text(
+        "INSERT INTO event_participants (id_event, participant_name, "
+        "participant_name_normalized, registration_date) "
+        "VALUES (:id_event, :name, :normalized, :now)"
+    )
+    for start in range(0, registrations, batch):
+        rows = []
+        for i in range(start, min(start + batch, registrations)):
+            person, vote = divmod(i, votes_per_participant)
+            name = f"Participante {person}"
+            rows.append(
+                {
+                    # Ideias distintas para a mesma pessoa: respeita o índice único
+                    "id_event": (person * votes_per_participant + vote) % events + 1,
+                    "name": name,
+                    "normalized": normalize_text(name),
+                    "now": now,
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert_vote, rows)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM event_vote_tally"))
+        conn.execute(sql_statements.get("backfill_vote_tally"))
+        if engine.dialect.name == "postgresql":
+            # Os ids foram informados explicitamente: acerta a sequência
+            conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('events', 'id_event'), "
+                    "(SELECT MAX(id_event) FROM events))"
+                )
+            )
+
+    engine.dispose()
+
+
+# ==================== SERVER ====================
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=SRC,
+        env=env,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("O servidor encerrou antes de ficar disponível")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError("O servidor não respondeu em 60 segundos")
+
+
+# ==================== LOAD ====================
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    base_url: str,
+    weights: dict[str, float],
+    duration: float,
+    concurrency: int,
+    events: int,
+    hot_events: int,
+) -> dict:
+    """
+    Run one request mix for ``duration`` seconds with ``concurrency`` workers.
+    """
+    operations = list(weights)
+    samples: dict[str, list[tuple[float, int]]] = {op: [] for op in operations}
+    counter = iter(range(10**12))
+    run_id = f"{os.getpid()}-{time.time_ns()}"  # Nomes novos a cada cenário
+    hot = list(range(1, min(hot_events, events) + 1))
+
+    async def request(client: httpx.AsyncClient, operation: str) -> int:
+        if operation == "vote":
+            event_id = random.choice(hot)
+            response = await client.post(
+                f"/eventos/{event_id}/participants",
+                json={"participant_name": f"Votante {run_id}-{next(counter)}"},
+            )
+        elif operation == "poll_registered":
+            response = await client.get("/eventos/registered/", params={"limit": 100})
+        elif operation == "poll_unique":
+            response = await client.get(
+                "/eventos/participants/unique", params={"limit": 100}
+            )
+        else:
+            response = await client.get("/eventos/ranking", params={"limit": 20})
+        return response.status_code
+
+    async def worker(client: httpx.AsyncClient, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            operation = random.choices(operations, weights=weights.values())[0]
+            start = time.perf_counter()
+            try:
+                status = await request(client, operation)
+            except httpx.HTTPError:
+                status = 0
+            samples[operation].append((time.perf_counter() - start, status))
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    routes = {}
+    for operation, values in samples.items():
+        if not values:
+            continue
+        latencies = sorted(latency * 1000 for latency, _ in values)
+        statuses: dict[str, int] = {}
+        for _, status in values:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        routes[ROUTES[operation]] = {
+            "requests": len(values),
+            "rps": round(len(values) / elapsed, 2),
+            # 409 num voto é duplicidade esperada, não falha do servidor
+            "errors": sum(1 for _, status in values if status == 0 or status >= 500),
+            "status": statuses,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 3),
+                "p95": round(percentile(latencies, 0.95), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+                "mean": round(sum(latencies) / len(latencies), 3),
+                "max": round(latencies[-1], 3),
+            },
+        }
+
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+# ==================== REPORT ====================
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """
+    Print req/s and p95 of every route next to the baseline report.
+    """
+    print(f"\nComparação com {baseline.get('commit')} -> {report.get('commit')}")
+    for scenario, result in report["scenarios"].items():
+        base_routes = baseline.get("scenarios", {}).get(scenario, {}).get("routes", {})
+        for route, stats in result["routes"].items():
+            base = base_routes.get(route)
+            if not base:
+                continue
+            rps_delta = (stats["rps"] / base["rps"] - 1) * 100 if base["rps"] else 0
+            p95, base_p95 = stats["latency_ms"]["p95"], base["latency_ms"]["p95"]
+            p95_delta = (p95 / base_p95 - 1) * 100 if base_p95 else 0
+            print(
+                f"  {scenario:<11} {route:<40} "
+                f"rps {base['rps']:>9.1f} -> {stats['rps']:>9.1f} ({rps_delta:+.1f}%)  "
+                f"p95 {base_p95:>8.2f} -> {p95:>8.2f} ms ({p95_delta:+.1f}%)"
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--engine", choices=["sqlite", "postgresql"], default="sqlite")
+    parser.add_argument("--sqlite-path", help="Arquivo SQLite (padrão: temporário)")
+    parser.add_argument("--no-seed", action="store_true", help="Usa os dados atuais")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--registrations", type=int, default=100_000)
+    parser.add_argument("--votes-per-participant", type=int, default=5)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=list(SCENARIOS),
+    )
+    parser.add_argument("--duration", type=float, default=20, help="Segundos")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--hot-events", type=int, default=10, help="Ideias que recebem os votos"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--async-db", action="store_true", help="Liga DB_ASYNC")
+    parser.add_argument("--output", default="benchmark-report.json")
+    parser.add_argument("--baseline", help="Relatório anterior para comparar")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    random.seed(args.seed)
+
+    env = {**os.environ, "DB_ENGINE": args.engine}
+    env["DB_ASYNC"] = "true" if args.async_db else "false"
+    tmp_dir = None
+    if args.engine == "sqlite":
+        if args.sqlite_path:
+            sqlite_path = args.sqlite_path
+        else:
+            tmp_dir = tempfile.TemporaryDirectory()
+            sqlite_path = os.path.join(tmp_dir.name, "benchmark.db")
+        env["DB_SQLITE_PATH"] = sqlite_path
+    os.environ.update(env)
+
+    if not args.no_seed:
+        started = time.perf_counter()
+        seed_database(args.events, args.registrations, args.votes_per_participant)
+        print(f"Seed: {time.perf_counter() - started:.1f}s")
+
+    server = start_server(args.port, env)
+    try:
+        scenarios = {}
+        for name in args.scenarios:
+            print(f"Cenário {name} ({args.duration:.0f}s)...")
+            scenarios[name] = asyncio.run(
+                run_scenario(
+                    f"http://127.0.0.1:{args.port}",
+                    SCENARIOS[name],
+                    args.duration,
+                    args.concurrency,
+                    args.events,
+                    args.hot_events,
+                )
+            )
+            print(f"  {scenarios[name]['rps']} req/s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline")
+        },
+        "scenarios": scenarios,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Relatório salvo em {args.output}")
+
+    if args.baseline:
+        compare(report, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
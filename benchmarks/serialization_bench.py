@@ -0,0 +1,130 @@
+"""
+Micro-benchmark of the list endpoints' response serialization.
+
+Compares, for the same SQLAlchemy rows, the previous path (one
+``model_validate(...).model_dump()`` per row in the CRUD layer, then FastAPI
+validating the dicts against ``response_model`` and encoding them) with
+``utils.FastJson.dump_rows`` served as ``JsonBytesResponse``. Both run through
+a FastAPI route called in process (no network), so only serialization differs.
+
+    python benchmarks/serialization_bench.py --rows 10000 100000 --repeat 5
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from backend.app.utils.FastJson import JsonBytesResponse, dump_rows  # noqa: E402
+from backend.app.validator.ParticipantValidatorSchema import (  # noqa: E402
+    ValidatorParticipantResponse,
+)
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+
+def load_rows(count: int) -> list:
+    """
+    Rows of event_participants as returned by the driver (sqlalchemy Row).
+    """
+    engine = create_engine("sqlite://")
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE event_participants (id_registration INTEGER, "
+                "id_event INTEGER, participant_name VARCHAR, registration_date "
+                "TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO event_participants VALUES (:id, :event, :name, :date)"),
+            [
+                {
+                    "id": i,
+                    "event": i % 500 + 1,
+                    "name": f"Participante {i}",
+                    "date": start + timedelta(seconds=i),
+                }
+                for i in range(1, count + 1)
+            ],
+        )
+        return conn.execute(
+            text(
+                "SELECT id_registration, id_event, participant_name, "
+                "registration_date FROM event_participants"
+            )
+        ).fetchall()
+
+
+def build_app(rows: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model_dump", response_model=list[ValidatorParticipantResponse])
+    async def model_dump_path():
+        return [
+            ValidatorParticipantResponse.model_validate(
+                dict(row._mapping)
+            ).model_dump()
+            for row in rows
+        ]
+
+    @app.get("/dump_rows", response_model=list[ValidatorParticipantResponse])
+    async def dump_rows_path():
+        return JsonBytesResponse(dump_rows(ValidatorParticipantResponse, rows))
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, repeat: int) -> tuple[list[float], bytes]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).content  # aquecimento
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = await client.get(path)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return timings, body
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'linhas':>8} {'caminho':>12} {'mediana ms':>11} {'mín ms':>8}")
+    for count in args.rows:
+        app = build_app(load_rows(count))
+        results = {}
+        for path in ("model_dump", "dump_rows"):
+            timings, body = asyncio.run(measure(app, f"/{path}", args.repeat))
+            results[path] = (statistics.median(timings), body)
+            print(
+                f"{count:>8} {path:>12} {statistics.median(timings) * 1000:>11.1f} "
+                f"{min(timings) * 1000:>8.1f}"
+            )
+
+        # Os dois caminhos precisam devolver o mesmo JSON
+        assert httpx.Response(200, content=results["model_dump"][1]).json() == (
+            httpx.Response(200, content=results["dump_rows"][1]).json()
+        )
+        speedup = results["model_dump"][0] / results["dump_rows"][0]
+        print(f"{count:>8} {'ganho':>12} {speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from sqlalchemy.orm import Session
 from ..validator.EventValidatorSchema import (
     ValidatorEventCreate,
     ValidatorEventResponse,
@@ -13,31 +12,256 @@ from ..validator.RegisteredEventValidatorSchema import (
     ValidatorRegisteredEventCreate,
     ValidatorRegisteredEventResponse,
 )
+from ..validator.VoteValidatorSchema import (
+    ValidatorVoteBatchCreate,
+    ValidatorVoteBatchResponse,
+    ValidatorVoteResult,
+)
+from ..validator.RankingValidatorSchema import ValidatorEventRankingResponse
+from ..validator.SimilarEventValidatorSchema import ValidatorSimilarEventResponse
+from ..validator.ProposalValidatorSchema import (
+    ValidatorProposalCreate,
+    ValidatorProposalResponse,
+)
+from ..validator.ChangeValidatorSchema import (
+    ValidatorChangeFeedResponse,
+    ValidatorChangeResponse,
+)
 from ..schemas.SchemaEvents import Events
 from ..schemas.SchemaEventParticipants import EventParticipant
 from ..schemas.SchemaRegisteredEvents import RegisteredEvent
-from ..engine_database.database import get_db, engine
-from ..utils.SqlReadFile import SqlReadFile
-from pathlib import Path
+from ..engine_database.database import DbSession
+from ..utils.SqlStatementRegistry import sql_statements
+from ..utils.KeysetCursor import decode_cursor, encode_cursor
+from ..utils.ReadCache import MISSING, read_cache
+from ..utils.DataVersion import data_version
+from ..utils.NormalizeText import normalize_text
+from ..utils.NgramIndex import event_name_index
+from ..utils.FastJson import dump_rows
+from ..utils.SqlMetrics import sql_metrics
+from ..utils.EventBroadcaster import event_broadcaster
 from fastapi import HTTPException
 from datetime import datetime, timezone
-from sqlalchemy import text
-from typing import Any, Dict, List
+import csv
+import io
+import json
+import os
+import random
+import re
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
 from sqlalchemy.exc import IntegrityError
+from pydantic import BaseModel
 from fastapi import HTTPException, status
 
 
+# Quantidade de contadores por evento em event_vote_tally
+VOTE_TALLY_SHARDS = max(1, int(os.getenv("VOTE_TALLY_SHARDS", "8")))
+
+# Linhas buscadas por vez do cursor do servidor na exportação
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_COLUMNS = (
+    "id_registration",
+    "id_event",
+    "event_name",
+    "participant_name",
+    "registration_date",
+)
+
+
+# Namespaces do cache de leitura (uma por listagem em cache)
+CACHE_REGISTERED_EVENTS = "registered_events"
+CACHE_UNIQUE_PARTICIPANTS = "unique_participants"
+CACHE_RANKING = "ranking"
+
+
+# ==================== SESSION HELPERS ====================
+# As funções abaixo aceitam tanto Session quanto AsyncSession (DB_ASYNC=true),
+# aguardando as chamadas somente quando a sessão é assíncrona.
+
+
+async def _execute(
+    db: DbSession, statement, params: dict | list[dict] | None = None
+):
+    if isinstance(db, AsyncSession):
+        result = await db.execute(statement, params or {})
+    else:
+        result = db.execute(statement, params or {})
+    # Resultados do ORM (select()) sempre trazem linhas e não têm returns_rows
+    if not getattr(result, "returns_rows", True):
+        return result
+
+    # As funções CRUD sempre leem o resultado inteiro: bufferiza aqui para
+    # contar as linhas entregues por query (SqlMetrics)
+    frozen = result.freeze()
+    sql_metrics.add_rows_returned(
+        statement.get_execution_options().get("query_name", "unnamed"),
+        len(frozen.data),
+    )
+    return frozen()
+
+
+async def _commit(db: DbSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
+
+    # Só invalida o cache depois que a escrita está visível para outras sessões
+    read_cache.invalidate(*db.info.pop("invalidate_cache", ()))
+    for callback in db.info.pop("after_commit", ()):
+        callback()
+
+
+async def _rollback(db: DbSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        db.rollback()
+
+    db.info.pop("invalidate_cache", None)
+    db.info.pop("after_commit", None)
+
+
+def _invalidate_on_commit(db: DbSession, *namespaces: str) -> None:
+    """
+    Mark read cache namespaces affected by a write of the current transaction.
+    They are dropped once the transaction commits.
+    """
+    db.info.setdefault("invalidate_cache", set()).update(namespaces)
+
+
+def _after_commit(db: DbSession, callback: Callable[[], None]) -> None:
+    """
+    Run ``callback`` once the current transaction commits (dropped on rollback).
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+def _publish_on_commit(db: DbSession, event_type: str, data: dict) -> None:
+    """
+    Send ``event_type`` to the /eventos/stream subscribers once the current
+    transaction commits.
+    """
+    _after_commit(db, lambda: event_broadcaster.publish(event_type, data))
+
+
+async def _log_changes(
+    db: DbSession,
+    entity: str,
+    operation: str,
+    changes: list[tuple[int, Optional[BaseModel]]],
+) -> None:
+    """
+    Append ``changes`` ((entity id, row model or None on delete)) to the
+    change log read by GET /eventos/changes, in the current transaction.
+    """
+    if not changes:
+        return
+    await _execute(
+        db,
+        sql_statements.get("insert_change_log"),
+        [
+            {
+                "entity": entity,
+                "entity_id": entity_id,
+                "operation": operation,
+                "payload": model.model_dump_json() if model is not None else None,
+            }
+            for entity_id, model in changes
+        ],
+    )
+
+
+async def _cached(namespace: str, key, loader: Callable):
+    """
+    Return the cached value of ``key`` or load it with ``loader()`` and cache it.
+    """
+    value = read_cache.get(namespace, key)
+    if value is not MISSING:
+        return value
+
+    generation = read_cache.generation(namespace)
+    value = await loader()
+    read_cache.set(namespace, key, value, generation)
+    return value
+
+
+def _integrity_status(error: IntegrityError) -> int:
+    """
+    Map a constraint violation to an HTTP status: a missing foreign key target
+    becomes 404 and a unique/other violation becomes 409.
+    """
+    code = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+    if code == "23503" or "FOREIGN KEY" in str(error.orig).upper():
+        return status.HTTP_404_NOT_FOUND
+    return status.HTTP_409_CONFLICT
+
+
+async def _update_vote_tally(db: DbSession, event_ids: list[int], delta: int) -> None:
+    """
+    Add ``delta`` to the vote counters of ``event_ids`` in the caller's
+    transaction. A random shard is used so concurrent votes on the same event
+    update different rows.
+    """
+    if not event_ids:
+        return
+
+    await _execute(
+        db,
+        sql_statements.get("increment_vote_tally"),
+        {
+            "event_ids": event_ids,
+            "shard": random.randrange(VOTE_TALLY_SHARDS),
+            "delta": delta,
+        },
+    )
+
+
+async def _fetch_page(
+    db: DbSession,
+    statement: str,
+    params: dict,
+    limit: int,
+    cursor: Optional[str],
+    cursor_names: tuple[str, ...],
+    sort_key: Callable,
+) -> tuple[list, Optional[str]]:
+    """
+    Keyset pagination: run ``statement`` for the first page, or
+    ``<statement>_after`` with the values decoded from ``cursor`` for the next
+    ones. Returns up to ``limit`` rows and the cursor of the following page
+    (None on the last page).
+    """
+    params = {**params, "limit": limit + 1}
+    if cursor:
+        try:
+            values = decode_cursor(cursor, len(cursor_names))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        params.update(zip(cursor_names, values))
+        statement = f"{statement}_after"
+
+    rows = (await _execute(db, sql_statements.get(statement), params)).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*sort_key(rows[-1]))
+
+    return rows, next_cursor
+
+
 # ==================== EVENT OPERATIONS ====================
 
 
 async def create_event(
-    db: Session, event: ValidatorEventCreate, commit: bool = True
+    db: DbSession, event: ValidatorEventCreate, commit: bool = True
 ) -> ValidatorEventResponse:
     """
     Create a new event in the database.
     """
-    current_dir = Path(__file__).parent
-
     # Validação: event_name não pode estar vazio
     if not event.event_name or len(event.event_name.strip()) == 0:
         raise HTTPException(
@@ -45,133 +269,158 @@ async def create_event(
             detail="Nome do evento não pode estar vazio",
         )
 
-    sql_file = "create_event"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    create_event_query = sql_reader.read_sql_file()
+    query = sql_statements.get("create_event")
 
     try:
-        result = db.execute(
-            text(create_event_query),
-            {"event_name": event.event_name.strip()},
+        result = await _execute(
+            db,
+            query,
+            {
+                "event_name": event.event_name.strip(),
+                "event_name_normalized": normalize_text(event.event_name),
+            },
         )
         row = result.mappings().one()  # 👈 importante
+        created_event = ValidatorEventResponse.model_validate(row)
+        await _log_changes(db, "event", "insert", [(row["id_event"], created_event)])
+        _invalidate_on_commit(db, CACHE_RANKING)
+        _after_commit(
+            db, lambda: event_name_index.add(row["id_event"], row["event_name"])
+        )
+        _publish_on_commit(
+            db,
+            "idea_created",
+            {"id_event": row["id_event"], "event_name": row["event_name"]},
+        )
         if commit:
-            db.commit()
+            await _commit(db)
 
     except IntegrityError:
-        db.rollback()
+        await _rollback(db)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
         )
 
     except Exception:
-        db.rollback()
+        await _rollback(db)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    return ValidatorEventResponse.model_validate(row)
+    return created_event
 
 
-async def get_event_by_id(db: Session, event_id: int) -> dict[str, Any]:
+async def get_event_by_id(db: DbSession, event_id: int) -> dict[str, Any]:
     """
     Get a specific event by ID.
     """
-    sql_file = "get_event_by_id"
-    current_dir = Path(__file__).parent
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    query = sql_reader.read_sql_file()
+    query = sql_statements.get("get_event_by_id")
 
-    row = db.execute(text(query), {"id_event": event_id}).fetchone()
+    row = (await _execute(db, query, {"id_event": event_id})).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Evento não encontrado!")
 
     return ValidatorEventResponse.model_validate(dict(row._mapping)).model_dump()
 
 
-async def get_all_events(db: Session) -> list[dict[str, Any]]:
+async def get_all_events(
+    db: DbSession, limit: int = 100, cursor: Optional[str] = None
+) -> tuple[bytes, Optional[str]]:
     """
-    Get all events from database.
+    Get a page of events (newest first) as JSON bytes and the cursor of the
+    next page.
     """
-    sql_file = "get_all_events"
-    current_dir = Path(__file__).parent
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-
-    sql_reader.read_sql_file()
-    rows = sql_reader.execute_query_sql()
+    rows, next_cursor = await _fetch_page(
+        db,
+        "get_all_events",
+        {},
+        limit,
+        cursor,
+        ("cursor_date", "cursor_id"),
+        lambda row: (row.create_date, row.id_event),
+    )
 
-    if not rows:
+    if not rows and not cursor:
         raise HTTPException(status_code=404, detail="Não há eventos cadastrados!")
 
-    return [ValidatorEventResponse.model_validate(row).model_dump() for row in rows]
+    return dump_rows(ValidatorEventResponse, rows), next_cursor
 
 
 async def update_event(
-    db: Session, event_id: int, event_update: ValidatorEventUpdate, commit: bool = True
+    db: DbSession,
+    event_id: int,
+    event_update: ValidatorEventUpdate,
+    commit: bool = True,
 ) -> ValidatorEventResponse:
     """
     Update an event in the database.
+    A single UPDATE ... RETURNING; no row back means the event does not exist.
     """
-    current_dir = Path(__file__).parent
+    query = sql_statements.get("update_event")
 
-    # Verificar se evento existe
-    row = db.execute(
-        text("SELECT id_event FROM events WHERE id_event = :id_event"),
-        {"id_event": event_id},
-    ).fetchone()
+    try:
+        result = await _execute(
+            db,
+            query,
+            {
+                "id_event": event_id,
+                "event_name": event_update.event_name,
+                "event_name_normalized": (
+                    normalize_text(event_update.event_name)
+                    if event_update.event_name is not None
+                    else None
+                ),
+            },
+        )
+        row = result.fetchone()
+    except IntegrityError:
+        await _rollback(db)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Evento '{event_update.event_name}' já existe!",
+        )
 
     if not row:
+        await _rollback(db)
         raise HTTPException(status_code=404, detail="Evento não encontrado!")
 
-    sql_file = "update_event"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    update_event_query = sql_reader.read_sql_file()
-    query = text(update_event_query)
-
-    result = db.execute(
-        query,
-        {
-            "id_event": event_id,
-            "event_name": event_update.event_name,
-        },
-    )
-
-    row = result.fetchone()
+    updated_event = ValidatorEventResponse.model_validate(row)
+    await _log_changes(db, "event", "update", [(row.id_event, updated_event)])
+    _invalidate_on_commit(db, CACHE_RANKING)
+    _after_commit(db, lambda: event_name_index.add(row.id_event, row.event_name))
     if commit:
-        db.commit()
-
-    if not row:
-        raise HTTPException(status_code=500, detail="Erro ao atualizar evento")
+        await _commit(db)
 
-    return ValidatorEventResponse.model_validate(row)
+    return updated_event
 
 
 async def delete_event(
-    db: Session, event_id: int, commit: bool = True
+    db: DbSession, event_id: int, commit: bool = True
 ) -> dict[str, Any]:
     """
     Delete an event from the database.
+    A single DELETE ... RETURNING; no row back means the event does not exist.
     """
-    current_dir = Path(__file__).parent
+    query = sql_statements.get("delete_event")
 
-    # Verificar se evento existe
-    row = db.execute(
-        text("SELECT id_event FROM events WHERE id_event = :id_event"),
-        {"id_event": event_id},
-    ).fetchone()
+    try:
+        row = (await _execute(db, query, {"id_event": event_id})).fetchone()
+    except IntegrityError:
+        await _rollback(db)
+        raise HTTPException(
+            status_code=409,
+            detail="Evento possui participantes ou registro e não pode ser removido!",
+        )
 
     if not row:
+        await _rollback(db)
         raise HTTPException(status_code=404, detail="Evento não encontrado!")
 
-    sql_file = "delete_event"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    delete_event_query = sql_reader.read_sql_file()
-    query = text(delete_event_query)
-
-    result = db.execute(query, {"id_event": event_id})
-
+    await _log_changes(db, "event", "delete", [(event_id, None)])
+    _invalidate_on_commit(db, CACHE_RANKING)
+    _after_commit(db, lambda: event_name_index.remove(event_id))
     if commit:
-        db.commit()
+        await _commit(db)
 
     return {"detail": f"Evento {event_id} deletado com sucesso"}
 
@@ -180,112 +429,211 @@ async def delete_event(
 
 
 async def register_participant(
-    db: Session,
+    db: DbSession,
     event_id: int,
     participant: ValidatorParticipantCreate,
     commit: bool = True,
 ) -> ValidatorParticipantResponse:
     """
     Register a participant in an event.
-    Each person can register only once per event (enforced by unique constraint).
+    Each person can register only once per event (enforced by the unique index
+    on the normalized name): INSERT ... ON CONFLICT DO NOTHING returns no row
+    for a duplicate, and the foreign key rejects a missing event.
     """
-    current_dir = Path(__file__).parent
-
-    # Validação: event existe
-    event_exists = db.execute(
-        text("SELECT id_event FROM events WHERE id_event = :id_event"),
-        {"id_event": event_id},
-    ).fetchone()
-
-    if not event_exists:
-        raise HTTPException(status_code=404, detail="Evento não encontrado!")
-
     # Validação: participant_name não pode estar vazio
-    if (
-        not participant.participant_name
-        or len(participant.participant_name.strip()) == 0
-    ):
+    participant_name_normalized = normalize_text(participant.participant_name or "")
+    if not participant_name_normalized:
         raise HTTPException(
             status_code=400, detail="Nome do participante não pode estar vazio"
         )
 
-    # Validação: participant não está registrado no evento
-    participant_exists = db.execute(
-        text(
-            "SELECT id_registration FROM event_participants WHERE id_event = :id_event AND participant_name = :participant_name"
-        ),
-        {
-            "id_event": event_id,
-            "participant_name": participant.participant_name.strip(),
-        },
-    ).fetchone()
+    query = sql_statements.get("register_participant")
+    try:
+        result = await _execute(
+            db,
+            query,
+            {
+                "id_event": event_id,
+                "participant_name": participant.participant_name.strip(),
+                "participant_name_normalized": participant_name_normalized,
+            },
+        )
+        row = result.fetchone()
+    except IntegrityError as e:
+        await _rollback(db)
+        if _integrity_status(e) == status.HTTP_404_NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Evento não encontrado!")
+        raise HTTPException(status_code=409)
 
-    if participant_exists:
+    if not row:
+        # Encerra a transação já: no SQLite até um INSERT que não inseriu nada
+        # segura o lock de escrita até o fim dela
+        await _rollback(db)
         raise HTTPException(
             status_code=409,
             detail=f"Participante '{participant.participant_name}' já está registrado neste evento!",
         )
 
-    sql_file = "register_participant"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    register_query = sql_reader.read_sql_file()
-    query = text(register_query)
-    result = db.execute(
-        query,
+    registration = ValidatorParticipantResponse.model_validate(row)
+    await _update_vote_tally(db, [event_id], 1)
+    await _log_changes(
+        db, "registration", "insert", [(row.id_registration, registration)]
+    )
+    _invalidate_on_commit(db, CACHE_UNIQUE_PARTICIPANTS, CACHE_RANKING)
+    _publish_on_commit(
+        db,
+        "vote_added",
         {
-            "id_event": event_id,
-            "participant_name": participant.participant_name.strip(),
+            "id_event": row.id_event,
+            "id_registration": row.id_registration,
+            "participant_name": row.participant_name,
         },
     )
-    row = result.fetchone()
     if commit:
-        db.commit()
-
-    if not row:
-        raise HTTPException(status_code=500, detail="Erro ao registrar participante")
+        await _commit(db)
 
-    return ValidatorParticipantResponse.model_validate(row)
+    return registration
 
 
-async def get_event_participants(db: Session, event_id: int) -> list[dict[str, Any]]:
+async def register_votes(
+    db: DbSession,
+    votes: ValidatorVoteBatchCreate,
+    commit: bool = True,
+) -> ValidatorVoteBatchResponse:
     """
-    Get all participants registered in a specific event.
+    Register one participant in many events with a single multi-row INSERT.
+    Each event gets its own status: created, duplicate or missing (no event).
     """
-    current_dir = Path(__file__).parent
+    participant_name = votes.participant_name.strip()
+    participant_name_normalized = normalize_text(participant_name)
+    if not participant_name_normalized:
+        raise HTTPException(
+            status_code=400, detail="Nome do participante não pode estar vazio"
+        )
+
+    # Remove ids repetidos mantendo a ordem enviada
+    event_ids = list(dict.fromkeys(votes.event_ids))
+
+    try:
+        rows = (
+            await _execute(
+                db,
+                sql_statements.get("register_votes"),
+                {
+                    "participant_name": participant_name,
+                    "participant_name_normalized": participant_name_normalized,
+                    "event_ids": event_ids,
+                },
+            )
+        ).fetchall()
+        created = {row.id_event: row.id_registration for row in rows}
+
+        # Só consulta os eventos quando algum voto não foi inserido
+        existing: set[int] = set()
+        pending = [event_id for event_id in event_ids if event_id not in created]
+        if pending:
+            existing = {
+                row.id_event
+                for row in (
+                    await _execute(
+                        db,
+                        sql_statements.get("get_existing_event_ids"),
+                        {"event_ids": pending},
+                    )
+                ).fetchall()
+            }
+
+        await _update_vote_tally(db, list(created), 1)
+        await _log_changes(
+            db,
+            "registration",
+            "insert",
+            [
+                (row.id_registration, ValidatorParticipantResponse.model_validate(row))
+                for row in rows
+            ],
+        )
+        if created:
+            _invalidate_on_commit(db, CACHE_UNIQUE_PARTICIPANTS, CACHE_RANKING)
+        for event_id, registration_id in created.items():
+            _publish_on_commit(
+                db,
+                "vote_added",
+                {
+                    "id_event": event_id,
+                    "id_registration": registration_id,
+                    "participant_name": participant_name,
+                },
+            )
+        if commit:
+            await _commit(db)
+    except Exception:
+        await _rollback(db)
+        raise HTTPException(status_code=500, detail="Erro ao registrar votos")
+
+    results = []
+    for event_id in event_ids:
+        if event_id in created:
+            results.append(
+                ValidatorVoteResult(
+                    id_event=event_id,
+                    status="created",
+                    id_registration=created[event_id],
+                )
+            )
+        elif event_id in existing:
+            results.append(ValidatorVoteResult(id_event=event_id, status="duplicate"))
+        else:
+            results.append(ValidatorVoteResult(id_event=event_id, status="missing"))
+
+    return ValidatorVoteBatchResponse(
+        participant_name=participant_name, results=results
+    )
 
+
+async def get_event_participants(
+    db: DbSession, event_id: int, limit: int = 100, cursor: Optional[str] = None
+) -> tuple[bytes, Optional[str]]:
+    """
+    Get a page of participants registered in a specific event (newest first)
+    as JSON bytes and the cursor of the next page.
+    """
     # Verificar se evento existe
-    event_exists = db.execute(
-        text("SELECT id_event FROM events WHERE id_event = :id_event"),
-        {"id_event": event_id},
+    event_exists = (
+        await _execute(
+            db,
+            sql_statements.get("event_exists"),
+            {"id_event": event_id},
+        )
     ).fetchone()
 
     if not event_exists:
         raise HTTPException(status_code=404, detail="Evento não encontrado!")
 
-    sql_file = "get_event_participants"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    query = sql_reader.read_sql_file()
-
-    rows = db.execute(text(query), {"id_event": event_id}).fetchall()
-    if not rows:
-        return []
+    rows, next_cursor = await _fetch_page(
+        db,
+        "get_event_participants",
+        {"id_event": event_id},
+        limit,
+        cursor,
+        ("cursor_date", "cursor_id"),
+        lambda row: (row.registration_date, row.id_registration),
+    )
 
-    return [
-        ValidatorParticipantResponse.model_validate(dict(row._mapping)).model_dump()
-        for row in rows
-    ]
+    return dump_rows(ValidatorParticipantResponse, rows), next_cursor
 
 
-async def get_participant_by_id(db: Session, registration_id: int) -> dict[str, Any]:
+async def get_participant_by_id(
+    db: DbSession, registration_id: int
+) -> dict[str, Any]:
     """
     Get a specific participant registration by ID.
     """
-    sql_file = "get_participant_by_id"
-    current_dir = Path(__file__).parent
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    query = sql_reader.read_sql_file()
+    query = sql_statements.get("get_participant_by_id")
 
-    row = db.execute(text(query), {"id_registration": registration_id}).fetchone()
+    row = (
+        await _execute(db, query, {"id_registration": registration_id})
+    ).fetchone()
     if not row:
         raise HTTPException(
             status_code=404, detail="Registro de participante não encontrado!"
@@ -295,82 +643,101 @@ async def get_participant_by_id(db: Session, registration_id: int) -> dict[str,
 
 
 async def update_participant(
-    db: Session,
+    db: DbSession,
     registration_id: int,
     participant_update: ValidatorParticipantUpdate,
     commit: bool = True,
 ) -> ValidatorParticipantResponse:
     """
     Update a participant registration.
+    A single UPDATE ... RETURNING; no row back means the registration does not exist.
     """
-    current_dir = Path(__file__).parent
+    participant_name = participant_update.participant_name
+    participant_name_normalized = None
+    if participant_name is not None:
+        participant_name = participant_name.strip()
+        participant_name_normalized = normalize_text(participant_name)
+        if not participant_name_normalized:
+            raise HTTPException(
+                status_code=400, detail="Nome do participante não pode estar vazio"
+            )
+
+    query = sql_statements.get("update_participant")
 
-    # Verificar se registro existe
-    row = db.execute(
-        text(
-            "SELECT id_registration FROM event_participants WHERE id_registration = :id_registration"
-        ),
-        {"id_registration": registration_id},
-    ).fetchone()
+    try:
+        result = await _execute(
+            db,
+            query,
+            {
+                "id_registration": registration_id,
+                "participant_name": participant_name,
+                "participant_name_normalized": participant_name_normalized,
+            },
+        )
+        row = result.fetchone()
+    except IntegrityError:
+        await _rollback(db)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Participante '{participant_update.participant_name}' já está registrado neste evento!",
+        )
 
     if not row:
+        await _rollback(db)
         raise HTTPException(
             status_code=404, detail="Registro de participante não encontrado!"
         )
 
-    sql_file = "update_participant"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    update_query = sql_reader.read_sql_file()
-    query = text(update_query)
-
-    result = db.execute(
-        query,
-        {
-            "id_registration": registration_id,
-            "participant_name": participant_update.participant_name,
-        },
+    registration = ValidatorParticipantResponse.model_validate(row)
+    await _log_changes(
+        db, "registration", "update", [(row.id_registration, registration)]
     )
-
-    row = result.fetchone()
+    _invalidate_on_commit(db, CACHE_UNIQUE_PARTICIPANTS)
+    if participant_name is not None:
+        _publish_on_commit(
+            db,
+            "participant_renamed",
+            {
+                "id_event": row.id_event,
+                "id_registration": row.id_registration,
+                "participant_name": row.participant_name,
+            },
+        )
     if commit:
-        db.commit()
+        await _commit(db)
 
-    if not row:
-        raise HTTPException(status_code=500, detail="Erro ao atualizar participante")
-
-    return ValidatorParticipantResponse.model_validate(row)
+    return registration
 
 
 async def delete_participant(
-    db: Session, registration_id: int, commit: bool = True
+    db: DbSession, registration_id: int, commit: bool = True
 ) -> dict[str, Any]:
     """
     Delete a participant registration from an event.
+    A single DELETE ... RETURNING; no row back means the registration does not exist.
     """
-    current_dir = Path(__file__).parent
+    query = sql_statements.get("delete_participant")
 
-    # Verificar se registro existe
-    row = db.execute(
-        text(
-            "SELECT id_registration FROM event_participants WHERE id_registration = :id_registration"
-        ),
-        {"id_registration": registration_id},
+    row = (
+        await _execute(db, query, {"id_registration": registration_id})
     ).fetchone()
 
     if not row:
+        await _rollback(db)
         raise HTTPException(
             status_code=404, detail="Registro de participante não encontrado!"
         )
 
-    sql_file = "delete_participant"
-    sql_reader = SqlReadFile(sql_file=sql_file, engine=engine, current_dir=current_dir)
-    delete_query = sql_reader.read_sql_file()
-    query = text(delete_query)
-
-    db.execute(query, {"id_registration": registration_id})
-
+    await _update_vote_tally(db, [row.id_event], -1)
+    await _log_changes(db, "registration", "delete", [(registration_id, None)])
+    _invalidate_on_commit(db, CACHE_UNIQUE_PARTICIPANTS, CACHE_RANKING)
+    _publish_on_commit(
+        db,
+        "vote_removed",
+        {"id_event": row.id_event, "id_registration": registration_id},
+    )
     if commit:
-        db.commit()
+        await _commit(db)
 
     return {"detail": f"Participante {registration_id} removido do evento com sucesso"}
 
@@ -379,7 +746,7 @@ async def delete_participant(
 
 
 async def register_event_creation(
-    db: Session,
+    db: DbSession,
     event_id: int,
     event_name: str,
     created_by: str,
@@ -387,59 +754,73 @@ async def register_event_creation(
 ) -> ValidatorRegisteredEventResponse:
     """
     Register a created event in the registered_events table.
-    Each event can only be registered once.
+    Each event can only be registered once: INSERT ... ON CONFLICT DO NOTHING
+    returns no row when it already was, and the foreign key rejects a missing event.
     """
-    current_dir = Path(__file__).parent
-
-    # Validação: event existe
-    event_exists = db.execute(
-        text("SELECT id_event FROM events WHERE id_event = :id_event"),
-        {"id_event": event_id},
-    ).fetchone()
-
-    if not event_exists:
-        raise HTTPException(status_code=404, detail="Evento não encontrado!")
+    query = sql_statements.get("register_event_creation")
 
-    # Validação: evento já foi registrado
-    event_registered = db.execute(
-        text(
-            "SELECT id_registered_event FROM registered_events WHERE id_event = :id_event"
-        ),
-        {"id_event": event_id},
-    ).fetchone()
+    try:
+        result = await _execute(
+            db,
+            query,
+            {
+                "id_event": event_id,
+                "event_name": event_name,
+                "created_by": created_by,
+            },
+        )
+        row = result.fetchone()
+    except IntegrityError as e:
+        await _rollback(db)
+        if _integrity_status(e) == status.HTTP_404_NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Evento não encontrado!")
+        raise HTTPException(status_code=409)
 
-    if event_registered:
+    if not row:
+        await _rollback(db)
         raise HTTPException(
             status_code=409,
             detail=f"Evento '{event_name}' já foi registrado!",
         )
 
-    # Inserir evento registrado
-    db_registered_event = RegisteredEvent(
-        id_event=event_id,
-        event_name=event_name,
-        created_by=created_by,
+    registered_event = ValidatorRegisteredEventResponse.model_validate(row)
+    await _log_changes(
+        db,
+        "registered_event",
+        "insert",
+        [(row.id_registered_event, registered_event)],
     )
-    db.add(db_registered_event)
+    _invalidate_on_commit(db, CACHE_REGISTERED_EVENTS)
     if commit:
-        db.commit()
-        db.refresh(db_registered_event)
+        await _commit(db)
 
-    return ValidatorRegisteredEventResponse.model_validate(db_registered_event)
+    return registered_event
 
 
-async def get_registered_events(db: Session) -> list[dict[str, Any]]:
+async def get_registered_events(
+    db: DbSession, limit: int = 100, cursor: Optional[str] = None
+) -> tuple[bytes, Optional[str]]:
     """
-    Get all registered events (created events, not voted events).
+    Get a page of registered events (created events, not voted events) as JSON
+    bytes and the cursor of the next page. Pages are served from the read cache.
     """
+
+    async def load():
+        rows, next_cursor = await _fetch_page(
+            db,
+            "get_registered_events",
+            {},
+            limit,
+            cursor,
+            ("cursor_date", "cursor_id"),
+            lambda row: (row.created_date, row.id_registered_event),
+        )
+        return dump_rows(ValidatorRegisteredEventResponse, rows), next_cursor
+
     try:
-        rows = db.query(RegisteredEvent).all()
-        if not rows:
-            return []
-        return [
-            ValidatorRegisteredEventResponse.model_validate(row).model_dump()
-            for row in rows
-        ]
+        return await _cached(CACHE_REGISTERED_EVENTS, (limit, cursor), load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao buscar eventos registrados: {str(e)}"
@@ -447,14 +828,21 @@ async def get_registered_events(db: Session) -> list[dict[str, Any]]:
 
 
 async def get_registered_event_by_id(
-    db: Session, registered_event_id: int
+    db: DbSession, registered_event_id: int
 ) -> dict[str, Any]:
     """
     Get a specific registered event by ID.
     """
     row = (
-        db.query(RegisteredEvent)
-        .filter(RegisteredEvent.id_registered_event == registered_event_id)
+        (
+            await _execute(
+                db,
+                select(RegisteredEvent)
+                .where(RegisteredEvent.id_registered_event == registered_event_id)
+                .execution_options(query_name="get_registered_event_by_id"),
+            )
+        )
+        .scalars()
         .first()
     )
 
@@ -465,44 +853,338 @@ async def get_registered_event_by_id(
 
 
 async def delete_registered_event(
-    db: Session, registered_event_id: int, commit: bool = True
+    db: DbSession, registered_event_id: int, commit: bool = True
 ) -> dict[str, Any]:
     """
     Delete a registered event.
+    A single DELETE ... RETURNING; no row back means it does not exist.
     """
-    # Verificar se registro existe
+    query = sql_statements.get("delete_registered_event")
+
     row = (
-        db.query(RegisteredEvent)
-        .filter(RegisteredEvent.id_registered_event == registered_event_id)
-        .first()
-    )
+        await _execute(db, query, {"id_registered_event": registered_event_id})
+    ).fetchone()
 
     if not row:
+        await _rollback(db)
         raise HTTPException(status_code=404, detail="Evento registrado não encontrado!")
 
-    db.delete(row)
+    await _log_changes(
+        db, "registered_event", "delete", [(registered_event_id, None)]
+    )
+    _invalidate_on_commit(db, CACHE_REGISTERED_EVENTS)
     if commit:
-        db.commit()
+        await _commit(db)
 
     return {"detail": f"Evento registrado {registered_event_id} removido com sucesso"}
 
 
-async def get_all_unique_participants(db: Session) -> List[Dict[str, str]]:
+async def get_all_unique_participants(
+    db: DbSession, limit: int = 100, cursor: Optional[str] = None
+) -> tuple[bytes, Optional[str]]:
     """
-    Retorna lista de participantes únicos (nomes distintos) em ordem alfabética.
+    Retorna uma página de participantes únicos em ordem alfabética (JSON em
+    bytes) e o cursor da próxima página. Nomes iguais após a normalização ("João  Silva" e
+    "joao silva") contam como uma pessoa, exibida com uma das grafias.
     Muito mais eficiente que iterar por evento.
+    As páginas são servidas pelo cache de leitura.
     """
-    sql = text("""
-        SELECT DISTINCT participant_name
-        FROM event_participants
-        WHERE participant_name IS NOT NULL AND participant_name != ''
-        ORDER BY participant_name ASC
-    """)
+
+    async def load():
+        rows, next_cursor = await _fetch_page(
+            db,
+            "get_unique_participants",
+            {},
+            limit,
+            cursor,
+            ("cursor_name",),
+            lambda row: (row.participant_name_normalized,),
+        )
+        return dump_rows(
+            dict[str, str],
+            [{"participant_name": row.participant_name.strip()} for row in rows],
+        ), next_cursor
 
     try:
-        result = db.execute(sql).fetchall()
-        return [{"participant_name": row[0].strip()} for row in result if row[0]]
+        return await _cached(CACHE_UNIQUE_PARTICIPANTS, (limit, cursor), load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao buscar participantes únicos: {str(e)}"
         )
+
+
+# ==================== RANKING OPERATIONS ====================
+
+
+async def get_event_ranking(db: DbSession, limit: int = 100) -> bytes:
+    """
+    Get events ordered by vote count (as JSON bytes), read from the vote
+    tally counters.
+    Cost grows with the number of events, not with the number of votes.
+    """
+
+    async def load():
+        rows = (
+            await _execute(
+                db, sql_statements.get("get_event_ranking"), {"limit": limit}
+            )
+        ).fetchall()
+        return dump_rows(ValidatorEventRankingResponse, rows)
+
+    return await _cached(CACHE_RANKING, limit, load)
+
+
+# ==================== SEARCH OPERATIONS ====================
+
+
+def _search_terms(query: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", normalize_text(query))
+
+
+async def search_events(
+    db: DbSession, query: str, limit: int = 20, offset: int = 0
+) -> bytes:
+    """
+    Ranked, accent-insensitive search over event names; every term of ``query``
+    matches as a word prefix ("bol pi" finds "Boliche com Pizza").
+    Postgres uses the search_vector column (GIN index); other backends filter
+    and rank the candidates in process.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return b"[]"
+
+    if db.get_bind().dialect.name == "postgresql":
+        rows = (
+            await _execute(
+                db,
+                sql_statements.get("search_events"),
+                {
+                    "tsquery": " & ".join(f"{term}:*" for term in terms),
+                    "limit": limit,
+                    "offset": offset,
+                },
+            )
+        ).fetchall()
+        return dump_rows(ValidatorEventResponse, rows)
+
+    # Fallback: o LIKE traz candidatos pelo termo mais longo, o resto é em Python
+    rows = (
+        await _execute(
+            db,
+            sql_statements.get("search_events_fallback"),
+            {"pattern": f"%{max(terms, key=len)}%"},
+        )
+    ).fetchall()
+
+    ranked = []
+    for row in rows:
+        words = _search_terms(row.event_name_normalized)
+        if all(any(word.startswith(term) for word in words) for term in terms):
+            exact = sum(term in words for term in terms)
+            ranked.append(((-exact, len(words), row.id_event), row))
+
+    ranked.sort(key=lambda item: item[0])
+    return dump_rows(
+        ValidatorEventResponse, [row for _, row in ranked[offset : offset + limit]]
+    )
+
+
+# ==================== SIMILARITY OPERATIONS ====================
+
+# Pontuação mínima (coeficiente de Dice entre trigramas) para sugerir uma ideia
+SIMILAR_MIN_SCORE = 0.3
+
+
+def get_similar_events(query: str, k: int = 5) -> list[ValidatorSimilarEventResponse]:
+    """
+    Get the events whose names look like ``query``, best match first.
+    Served by the in-memory trigram index; the database is not queried.
+    """
+    return [
+        ValidatorSimilarEventResponse(id_event=id_event, event_name=name, score=score)
+        for id_event, name, score in event_name_index.search(
+            query, k, SIMILAR_MIN_SCORE
+        )
+    ]
+
+
+# ==================== EXPORT OPERATIONS ====================
+
+
+def _format_export_rows(rows, export_format: str) -> str:
+    records = [
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    ]
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, record)), ensure_ascii=False) + "\n"
+        for record in records
+    )
+
+
+def stream_participants_export(
+    db: DbSession, export_format: str
+) -> Iterator[str] | AsyncIterator[str]:
+    """
+    Stream every registration, with its event name, as CSV or NDJSON.
+    Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time, so memory
+    stays constant whatever the table size.
+    """
+    statement = sql_statements.get("export_participants").execution_options(
+        stream_results=True, yield_per=EXPORT_BATCH_SIZE
+    )
+    header = (
+        _format_export_rows([EXPORT_COLUMNS], "csv") if export_format == "csv" else ""
+    )
+
+    if isinstance(db, AsyncSession):
+
+        async def generate_async() -> AsyncIterator[str]:
+            if header:
+                yield header
+            result = await db.stream(statement)
+            async for rows in result.partitions():
+                sql_metrics.add_rows_returned("export_participants", len(rows))
+                yield _format_export_rows(rows, export_format)
+
+        return generate_async()
+
+    # Gerador síncrono: o StreamingResponse o consome numa thread do pool
+    def generate() -> Iterator[str]:
+        if header:
+            yield header
+        result = db.execute(statement)
+        for rows in result.partitions():
+            sql_metrics.add_rows_returned("export_participants", len(rows))
+            yield _format_export_rows(rows, export_format)
+
+    return generate()
+
+
+# ==================== CHANGE FEED OPERATIONS ====================
+
+# Postgres: idade mínima de uma alteração para entrar no feed (ver get_changes.sql)
+CHANGE_LOG_SETTLE_SECONDS = float(os.getenv("CHANGE_LOG_SETTLE_SECONDS", "2"))
+
+
+async def get_changes(
+    db: DbSession, since: int = 0, limit: int = 500
+) -> ValidatorChangeFeedResponse:
+    """
+    Changes to events, registrations and registered events committed after
+    the ``since`` cursor, oldest first. Inserts and updates carry the whole
+    row, so a client mirror applies them as upserts.
+    Answers 410 (with the current cursor) when the entries after ``since``
+    were already dropped by the retention: the client must reload the lists.
+    """
+    bounds = (
+        await _execute(db, sql_statements.get("get_change_log_bounds"))
+    ).fetchone()
+    if since < bounds.first_id - 1 or since > bounds.last_id:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "message": "Cursor expirado: recarregue as listagens",
+                "cursor": bounds.last_id,
+            },
+        )
+
+    rows = (
+        await _execute(
+            db,
+            sql_statements.get("get_changes"),
+            {
+                "since": since,
+                "limit": limit + 1,
+                "settle_seconds": CHANGE_LOG_SETTLE_SECONDS,
+            },
+        )
+    ).fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return ValidatorChangeFeedResponse(
+        changes=[
+            ValidatorChangeResponse(
+                id_change=row.id_change,
+                entity=row.entity,
+                entity_id=row.entity_id,
+                operation=row.operation,
+                data=json.loads(row.payload) if row.payload else None,
+                change_date=row.change_date,
+            )
+            for row in rows
+        ],
+        next_cursor=rows[-1].id_change if rows else since,
+        has_more=has_more,
+    )
+
+
+# ==================== PROPOSAL OPERATIONS ====================
+
+
+async def create_proposal(
+    db: DbSession, proposal: ValidatorProposalCreate
+) -> ValidatorProposalResponse:
+    """
+    Create an event, record who proposed it and register the creator's vote
+    plus the extra votes, all in a single transaction.
+    Nothing is kept when any step fails.
+    """
+    try:
+        event = await create_event(
+            db, ValidatorEventCreate(event_name=proposal.event_name), commit=False
+        )
+        registered_event = await register_event_creation(
+            db,
+            event.id_event,
+            event.event_name,
+            proposal.created_by.strip(),
+            commit=False,
+        )
+        votes = await register_votes(
+            db,
+            ValidatorVoteBatchCreate(
+                participant_name=proposal.created_by,
+                event_ids=[event.id_event, *proposal.event_ids],
+            ),
+            commit=False,
+        )
+        await _commit(db)
+    except HTTPException:
+        await _rollback(db)
+        raise
+
+    return ValidatorProposalResponse(
+        event=event, registered_event=registered_event, votes=votes
+    )
+
+
+async def get_data_version(db: DbSession) -> tuple[str, Optional[str]]:
+    """
+    ``(ETag, Last-Modified)`` of the current data, from the newest entries of
+    the change log (shared by every worker). When the version moved since this
+    process last read it, the cached listings are dropped: the write may come
+    from another worker, which only invalidated its own cache.
+    """
+    row = (
+        await _execute(
+            db,
+            sql_statements.get("get_data_version"),
+            {"settle_seconds": CHANGE_LOG_SETTLE_SECONDS},
+        )
+    ).fetchone()
+
+    if data_version.observe(row.settled, row.latest):
+        read_cache.invalidate(
+            CACHE_REGISTERED_EVENTS, CACHE_UNIQUE_PARTICIPANTS, CACHE_RANKING
+        )
+    return data_version.validators(row.settled, row.latest, row.last_change)
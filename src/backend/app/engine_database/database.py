@@ -1,33 +1,209 @@
+from fastapi import HTTPException
 from ..utils.ConnectionDatabaseSql import ConnectionDatabase
 from ..schemas import Base
 from ..schemas.SchemaEventParticipants import EventParticipant
 from ..schemas.SchemaEvents import Events
 from ..schemas.SchemaRegisteredEvents import RegisteredEvent
-from sqlalchemy.orm import sessionmaker
+from ..schemas.SchemaEventVoteTally import EventVoteTally
+from ..schemas.SchemaChangeLog import ChangeLog
+from ..utils.SqlStatementRegistry import sql_statements
+from ..utils.NgramIndex import event_name_index
+from ..utils.StartupState import startup_state
+from .migrations import run_migrations
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import DateTime, bindparam
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Union
+import asyncio
+import os
+import random
+import traceback
 
+DbSession = Union[Session, AsyncSession]
 
-def initialize_database():
+
+def initialize_database() -> None:
+    """
+    Check the connection, create/migrate the schema and load the in-memory
+    data. Blocking: the lifespan runs it in a thread (see start_database).
+    """
+    with startup_state.phase("connect"):
+        connection.ping()
+    with startup_state.phase("schema"):
+        connection.create_schema(max_retries=1, migrate=run_migrations)
+    with startup_state.phase("vote_tally"):
+        backfill_vote_tally(engine)
+    with startup_state.phase("name_index"):
+        load_event_name_index(engine)
+
+
+async def start_database(
+    max_retries: int | None = None, base_delay: float = 0.5, max_delay: float = 15.0
+) -> bool:
+    """
+    Run initialize_database with exponential backoff (with jitter) while the
+    database is unreachable, without blocking the event loop: /healthz keeps
+    answering and /readyz reports the progress. Returns False if it gave up:
+    after max_retries, or at once on any other error (configuration, schema),
+    which marks the startup as fatal so /healthz fails and the process is
+    restarted. Readiness is set by the caller, after the warm-up.
+    """
+    if max_retries is None:
+        max_retries = int(os.getenv("DB_STARTUP_MAX_RETRIES", "10"))
+
+    for attempt in range(1, max_retries + 1):
+        startup_state.attempts = attempt
+        try:
+            await asyncio.to_thread(initialize_database)
+            return True
+        except OperationalError as e:
+            startup_state.set_failed(f"Banco indisponível: {e.orig or e}")
+            if attempt == max_retries:
+                break
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)
+            print(f"Tentativa {attempt}/{max_retries} falhou; nova tentativa em {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            # Configuração ausente, erro de schema/migração: repetir não resolve
+            traceback.print_exc()
+            startup_state.set_fatal(f"Falha na inicialização: {e}")
+            return False
+
+    startup_state.set_fatal(f"{startup_state.error} (após {max_retries} tentativas)")
+    return False
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled connections on shutdown.
+    """
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+def backfill_vote_tally(engine) -> None:
+    """
+    Fill event_vote_tally from event_participants when the tally is empty
+    (first start after the table was added). No-op otherwise.
+    """
+    with engine.begin() as conn:
+        conn.execute(sql_statements.get("backfill_vote_tally"))
+
+
+def compact_change_log(engine) -> int:
+    """
+    Keep the change log bounded: drop the entries older than
+    CHANGE_LOG_RETENTION_HOURS or beyond the last CHANGE_LOG_MAX_ROWS (always
+    a prefix, so cursors before it get 410), then the entries superseded by
+    a newer change of the same row. Returns the number of deleted entries.
+    """
+    retention = timedelta(hours=float(os.getenv("CHANGE_LOG_RETENTION_HOURS", "24")))
+    max_rows = int(os.getenv("CHANGE_LOG_MAX_ROWS", "100000"))
+    # Tipado para o SQLite gravar/comparar no mesmo formato de CURRENT_TIMESTAMP
+    expired_query = sql_statements.get("get_expired_change_id").bindparams(
+        bindparam("cutoff", type_=DateTime(timezone=True))
+    )
+
+    deleted = 0
+    with engine.begin() as conn:
+        bounds = conn.execute(sql_statements.get("get_change_log_bounds")).fetchone()
+        expired_id = conn.execute(
+            expired_query, {"cutoff": datetime.now(timezone.utc) - retention}
+        ).scalar()
+        # A última alteração fica sempre: é ela que mantém os cursores atuais válidos
+        horizon = min(max(expired_id, bounds.last_id - max_rows), bounds.last_id - 1)
+        if horizon >= bounds.first_id:
+            deleted += conn.execute(
+                sql_statements.get("delete_expired_changes"), {"horizon": horizon}
+            ).rowcount
+        deleted += conn.execute(sql_statements.get("compact_change_log")).rowcount
+    return deleted
+
+
+async def run_change_log_compaction() -> None:
     """
-    Initialize the database connection and create tables if they do not exist.
+    Run compact_change_log every CHANGE_LOG_COMPACT_SECONDS once the API is
+    ready, in a worker thread. Runs until cancelled on shutdown.
     """
-    connection = ConnectionDatabase(base=Base)
-    engine = connection.connect()
-    create_schema = connection.create_schema()
-    return engine, create_schema
+    interval = float(os.getenv("CHANGE_LOG_COMPACT_SECONDS", "300"))
+    while True:
+        await asyncio.sleep(interval)
+        if not startup_state.ready:
+            continue
+        try:
+            deleted = await asyncio.to_thread(compact_change_log, engine)
+            if deleted:
+                print(f"Log de alterações compactado: {deleted} entradas removidas")
+        except Exception as e:
+            print(f"Falha ao compactar o log de alterações: {e}")
 
 
-engine, create_schema = initialize_database()
+def load_event_name_index(engine) -> None:
+    """
+    Build the in-memory trigram index of event names used by /eventos/similar.
+    Later writes keep it up to date (see crud/create_crud.py).
+    """
+    with engine.connect() as conn:
+        event_name_index.rebuild(
+            conn.execute(sql_statements.get("get_event_names")).fetchall()
+        )
+
+
+# Engines são preguiçosos: nenhuma conexão é aberta na importação
+connection = ConnectionDatabase(base=Base)
+engine = connection.create_engines()
+async_engine = connection.async_engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+def _ensure_ready() -> None:
+    if not startup_state.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Banco de dados ainda em inicialização",
+            headers={"Retry-After": "2"},
+        )
 
-def get_db():
+
+def get_sync_db():
     """
     Dependency to get the database session.
     Yields a database session that can be used in CRUD operations.
     """
+    _ensure_ready()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an asyncio database session.
+    Queries awaited on it release the event loop while Postgres works.
+    """
+    _ensure_ready()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_db = get_async_db if AsyncSessionLocal is not None else get_sync_db
+
+
+def get_request_pool():
+    """
+    Return the pool used by the request sessions (async pool when enabled).
+    """
+    return async_engine.pool if async_engine is not None else engine.pool
@@ -0,0 +1,210 @@
+from ..utils.NormalizeText import normalize_text
+from ..utils.SqlStatementRegistry import sql_statements
+from sqlalchemy import bindparam, inspect, text
+
+
+def run_migrations(engine) -> None:
+    """
+    Bring tables created by older versions up to date with the models.
+    Runs after create_all and before the missing indexes are created; every
+    step checks the current schema first, so it is a no-op on a fresh database.
+    """
+    add_participant_name_normalized(engine)
+    add_event_search(engine)
+    renormalize_non_ascii_names(engine)
+
+
+def _columns(engine, table: str) -> set[str]:
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def _add_normalized_column(conn, table: str, id_column: str, source: str) -> None:
+    """
+    Add ``<source>_normalized`` to ``table`` and fill it with normalize_text.
+    """
+    target = f"{source}_normalized"
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {target} VARCHAR(255)"))
+
+    rows = conn.execute(text(f"SELECT {id_column}, {source} FROM {table}")).fetchall()
+    if rows:
+        conn.execute(
+            text(f"UPDATE {table} SET {target} = :value WHERE {id_column} = :id"),
+            [{"id": row[0], "value": normalize_text(row[1])} for row in rows],
+        )
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {target} SET NOT NULL"))
+
+
+def add_participant_name_normalized(engine) -> None:
+    """
+    Add and fill event_participants.participant_name_normalized.
+    Registrations that become duplicates once names are normalized are merged
+    (the oldest one is kept) and the vote tally is rebuilt from what is left.
+    """
+    if "participant_name_normalized" in _columns(engine, "event_participants"):
+        return
+
+    with engine.begin() as conn:
+        _add_normalized_column(
+            conn, "event_participants", "id_registration", "participant_name"
+        )
+
+        conn.execute(
+            text(
+                "DELETE FROM event_participants WHERE id_registration NOT IN ("
+                "SELECT MIN(id_registration) FROM event_participants "
+                "GROUP BY id_event, participant_name_normalized)"
+            )
+        )
+        conn.execute(text("DELETE FROM event_vote_tally"))
+        conn.execute(sql_statements.get("backfill_vote_tally"))
+
+        # Índices antigos sobre o nome bruto deixam de ser usados
+        conn.execute(text("DROP INDEX IF EXISTS idx_event_participants_name"))
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "ALTER TABLE event_participants "
+                    "DROP CONSTRAINT IF EXISTS uq_event_participant"
+                )
+            )
+
+
+def add_event_search(engine) -> None:
+    """
+    Add events.event_name_normalized and, on Postgres, the search_vector
+    column generated from it with its GIN index (used by /eventos/search).
+    """
+    columns = _columns(engine, "events")
+
+    with engine.begin() as conn:
+        if "event_name_normalized" not in columns:
+            _add_normalized_column(conn, "events", "id_event", "event_name")
+
+        if engine.dialect.name == "postgresql" and "search_vector" not in columns:
+            conn.execute(
+                text(
+                    "ALTER TABLE events ADD COLUMN search_vector tsvector "
+                    "GENERATED ALWAYS AS "
+                    "(to_tsvector('simple', event_name_normalized)) STORED"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_events_search_vector "
+                    "ON events USING GIN (search_vector)"
+                )
+            )
+
+
+def _non_ascii(conn, column: str) -> str:
+    """
+    SQL condition matching values with a character outside ASCII.
+    """
+    if conn.dialect.name == "postgresql":
+        return f"{column} ~ '[^\\x01-\\x7F]'"
+    return f"{column} GLOB '*[^' || char(1) || '-' || char(127) || ']*'"
+
+
+def renormalize_non_ascii_names(engine) -> None:
+    """
+    Recompute the normalized names written by the former normalize_text,
+    which dropped every non-ASCII letter: "Иван" became "" and "Øyvind" the
+    same person as "yvind". Both versions agree on ASCII-only names, so only
+    the other rows are read. Registrations that now share the same key in an
+    event are merged the way add_participant_name_normalized does (oldest
+    kept, logged as deleted in the change log, vote tally rebuilt).
+    """
+    with engine.begin() as conn:
+        events = [
+            {"id": row[0], "value": normalize_text(row[1])}
+            for row in conn.execute(
+                text(
+                    "SELECT id_event, event_name, event_name_normalized FROM events "
+                    f"WHERE {_non_ascii(conn, 'event_name')}"
+                )
+            )
+            if normalize_text(row[1]) != row[2]
+        ]
+        if events:
+            conn.execute(
+                text(
+                    "UPDATE events SET event_name_normalized = :value "
+                    "WHERE id_event = :id"
+                ),
+                events,
+            )
+
+        stale = {
+            row[0]: (row[1], normalize_text(row[2]))
+            for row in conn.execute(
+                text(
+                    "SELECT id_registration, id_event, participant_name, "
+                    "participant_name_normalized FROM event_participants "
+                    f"WHERE {_non_ascii(conn, 'participant_name')}"
+                )
+            )
+            if normalize_text(row[2]) != row[3]
+        }
+        if not stale:
+            return
+
+        # Agrupa pela chave nova, incluindo quem já tinha essa chave no evento
+        groups: dict[tuple[int, str], list[int]] = {}
+        for id_registration, key in stale.items():
+            groups.setdefault(key, []).append(id_registration)
+        existing = text(
+            "SELECT id_registration, id_event, participant_name_normalized "
+            "FROM event_participants "
+            "WHERE participant_name_normalized IN :keys"
+        ).bindparams(bindparam("keys", expanding=True))
+        for row in conn.execute(existing, {"keys": sorted({k[1] for k in groups})}):
+            if row[0] not in stale and (row[1], row[2]) in groups:
+                groups[(row[1], row[2])].append(row[0])
+
+        duplicates = {
+            id_registration
+            for ids in groups.values()
+            for id_registration in ids
+            if id_registration != min(ids)
+        }
+        if duplicates:
+            conn.execute(
+                text("DELETE FROM event_participants WHERE id_registration = :id"),
+                [{"id": id_registration} for id_registration in sorted(duplicates)],
+            )
+            conn.execute(
+                sql_statements.get("insert_change_log"),
+                [
+                    {
+                        "entity": "registration",
+                        "entity_id": id_registration,
+                        "operation": "delete",
+                        "payload": None,
+                    }
+                    for id_registration in sorted(duplicates)
+                ],
+            )
+
+        # Duas passagens: um valor temporário (com espaço inicial, que o nome
+        # normalizado nunca tem) evita colidir com o índice único enquanto as
+        # chaves trocam de linha
+        updates = [
+            {"id": id_registration, "value": key[1]}
+            for id_registration, key in stale.items()
+            if id_registration not in duplicates
+        ]
+        update = text(
+            "UPDATE event_participants SET participant_name_normalized = :value "
+            "WHERE id_registration = :id"
+        )
+        if updates:
+            conn.execute(
+                update, [{"id": u["id"], "value": f" #{u['id']}"} for u in updates]
+            )
+            conn.execute(update, updates)
+
+        if duplicates:
+            conn.execute(text("DELETE FROM event_vote_tally"))
+            conn.execute(sql_statements.get("backfill_vote_tally"))
@@ -0,0 +1,233 @@
+from contextlib import AsyncExitStack
+from datetime import date, datetime
+from pydantic import BaseModel
+from sqlalchemy import bindparam, text
+from sqlalchemy.pool import QueuePool
+from types import NoneType, SimpleNamespace, UnionType
+from typing import Literal, Union, get_args, get_origin
+from .. import validator
+from ..crud import create_crud as crud
+from ..utils.StartupState import startup_state
+from ..utils.SqlStatementRegistry import sql_statements
+from .database import AsyncSessionLocal, SessionLocal, async_engine, engine
+import asyncio
+import importlib
+import pkgutil
+
+
+async def warm_up() -> None:
+    """
+    Pay the cold-start costs before /readyz turns 200: pool connections,
+    the registered statements (and, with DB_ASYNC, the prepared statements of
+    each async connection), the response models and the read caches.
+    Every step is best effort: a failure is logged and startup goes on.
+    """
+    for name, step in (
+        ("warmup_pool", _fill_pool),
+        ("warmup_statements", _explain_statements),
+        ("warmup_async_statements", _prepare_async_statements),
+        ("warmup_models", _validate_response_models),
+        ("warmup_caches", _fill_read_caches),
+    ):
+        with startup_state.phase(name):
+            try:
+                await step()
+            except Exception as e:
+                print(f"Aquecimento '{name}' falhou: {e}")
+
+
+async def _fill_pool() -> None:
+    """
+    Open ``pool_size`` connections of the request pool at the same time, so
+    they are idle in the pool (instead of connecting during the first requests).
+    """
+    pool = async_engine.pool if async_engine is not None else engine.pool
+    size = pool.size() if isinstance(pool, QueuePool) else 1
+
+    if async_engine is not None:
+        async with AsyncExitStack() as stack:
+            for _ in range(size):
+                await stack.enter_async_context(async_engine.connect())
+        return
+
+    def fill() -> None:
+        connections = [engine.connect() for _ in range(size)]
+        for conn in connections:
+            conn.close()
+
+    await asyncio.to_thread(fill)
+
+
+def _null_params(statement, dialect) -> tuple[dict, list[str]]:
+    """
+    Parameters that make a registry statement cheap to plan or run: NULL for
+    every bind (a one-item list for expanding ones) and ``LIMIT 0``.
+    """
+    binds = statement.compile(dialect=dialect).binds
+    expanding = [key for key, bind in binds.items() if bind.expanding]
+    params = {key: [None] if key in expanding else None for key in binds}
+    if "limit" in params:
+        params["limit"] = 0
+    return params, expanding
+
+
+def _is_read(statement) -> bool:
+    for line in statement.text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("--"):
+            return line.upper().startswith("SELECT")
+    return False
+
+
+async def _explain_statements() -> None:
+    """
+    Run EXPLAIN (never the statement itself) for every file of sql/query with
+    NULL parameters: the database parses and plans each one, and files that no
+    longer match the schema show up in the log.
+    """
+
+    def explain() -> list[str]:
+        failed = []
+        for name, statement in sql_statements.statements.items():
+            params, expanding = _null_params(statement, engine.dialect)
+            explain_statement = text(f"EXPLAIN\n{statement.text}").bindparams(
+                *[bindparam(key, expanding=True) for key in expanding]
+            )
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        explain_statement.execution_options(query_name="warmup"),
+                        params,
+                    )
+            except Exception:
+                failed.append(name)
+        return failed
+
+    failed = await asyncio.to_thread(explain)
+    if failed:
+        print(f"Queries que não passaram no EXPLAIN: {', '.join(sorted(failed))}")
+
+
+async def _prepare_async_statements() -> None:
+    """
+    DB_ASYNC only: run every parameterized SELECT of the registry on each
+    connection of the async pool (NULL parameters, LIMIT 0). asyncpg keeps a
+    prepared-statement cache per connection, and the EXPLAIN above only goes
+    through the sync engine, so this is what moves the prepare round trip out
+    of the first requests. Statements without parameters (full reads used at
+    startup or by the export) are left out.
+    """
+    if async_engine is None:
+        return
+
+    statements = []
+    for name, statement in sql_statements.statements.items():
+        params, _ = _null_params(statement, async_engine.dialect)
+        if _is_read(statement) and params:
+            statements.append((name, statement, params))
+
+    failed: set[str] = set()
+
+    async def prepare(conn) -> None:
+        for name, statement, params in statements:
+            try:
+                await conn.execute(
+                    statement.execution_options(query_name="warmup"), params
+                )
+            except Exception:
+                failed.add(name)
+                await conn.rollback()
+        await conn.rollback()
+
+    pool = async_engine.pool
+    size = pool.size() if isinstance(pool, QueuePool) else 1
+    async with AsyncExitStack() as stack:
+        # Todas abertas ao mesmo tempo: cada uma é uma conexão diferente do pool
+        connections = [
+            await stack.enter_async_context(async_engine.connect()) for _ in range(size)
+        ]
+        await asyncio.gather(*(prepare(conn) for conn in connections))
+
+    if failed:
+        print(
+            f"Queries que falharam no aquecimento assíncrono: {', '.join(sorted(failed))}"
+        )
+
+
+def _dummy_value(annotation):
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (Union, UnionType):
+        return None if NoneType in args else _dummy_value(args[0])
+    if origin is Literal:
+        return args[0]
+    if origin is list:
+        return [_dummy_value(args[0])] if args else []
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _dummy_row(annotation)
+    if annotation is datetime:
+        return datetime.now()
+    if annotation is date:
+        return date.today()
+    if annotation is bool:
+        return True
+    if annotation in (int, float):
+        return annotation(1)
+    return "warmup"
+
+
+def _dummy_row(model: type[BaseModel]) -> dict:
+    return {
+        name: _dummy_value(field.annotation)
+        for name, field in model.model_fields.items()
+    }
+
+
+def _response_models() -> list[type[BaseModel]]:
+    models = []
+    for module_info in pkgutil.iter_modules(validator.__path__):
+        module = importlib.import_module(f"{validator.__name__}.{module_info.name}")
+        models += [
+            value
+            for name, value in vars(module).items()
+            if name.startswith("Validator")
+            and name.endswith("Response")
+            and isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and value.__module__ == module.__name__
+        ]
+    return models
+
+
+async def _validate_response_models() -> None:
+    """
+    Validate and serialize a dummy row through each Validator*Response, the
+    way the routes do (rows come as attribute objects from SQLAlchemy).
+    """
+    for model in _response_models():
+        row = _dummy_row(model)
+        if model.model_config.get("from_attributes"):
+            model.model_validate(SimpleNamespace(**row)).model_dump_json()
+        model.model_validate(row).model_dump_json()
+
+
+async def _fill_read_caches() -> None:
+    """
+    Load the first page of the cached listings with the routes' default limit.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            await _load_listings(db)
+        return
+
+    db = SessionLocal()
+    try:
+        await _load_listings(db)
+    finally:
+        db.close()
+
+
+async def _load_listings(db) -> None:
+    await crud.get_registered_events(db, limit=100)
+    await crud.get_all_unique_participants(db, limit=100)
+    await crud.get_event_ranking(db, limit=100)
@@ -1,15 +1,59 @@
+from .utils.StartupState import startup_state  # primeiro: mede as importações
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .engine_database.database import engine, create_schema
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .engine_database.database import (
+    connection,
+    dispose_engines,
+    engine,
+    get_request_pool,
+    run_change_log_compaction,
+    start_database,
+)
+from .engine_database.warmup import warm_up
 from .routes.routes_events import router_events
+from .utils.PoolMetrics import pool_metrics
+from .utils.ReadCache import read_cache
+from .utils.Metrics import MetricsMiddleware, render_gauges, request_metrics
+from .utils.SqlMetrics import sql_metrics
+from .utils.EventBroadcaster import event_broadcaster
+import asyncio
+import os
 
 engine = engine
-create_schema = create_schema
+startup_state.mark("import")
+
+
+async def startup() -> None:
+    if not await start_database():
+        return
+    # STARTUP_WARMUP=false declara a API pronta sem o aquecimento
+    if os.getenv("STARTUP_WARMUP", "true").lower() == "true":
+        await warm_up()
+    startup_state.set_ready()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize the database in the background: the server accepts
+    connections right away and /readyz turns 200 once it is done.
+    """
+    startup_task = asyncio.create_task(startup())
+    compaction_task = asyncio.create_task(run_change_log_compaction())
+    yield
+    startup_task.cancel()
+    compaction_task.cancel()
+    await dispose_engines()
+
 
 app = FastAPI(
     title="Youth Event Registration API",
     description="Sistema de cadastro de eventos e registro de participantes",
     version="1.0.0",
+    lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -17,4 +61,75 @@ async def read_root():
     return {"status": "online", "message": "API is up and running"}
 
 
+@app.get("/healthz")
+async def read_health():
+    """Liveness: fails only once startup gave up (database not checked)"""
+    state = startup_state.snapshot()
+    if state["fatal"]:
+        return JSONResponse(
+            {"status": "failed", "error": state["error"]}, status_code=503
+        )
+    return {"status": "alive", "uptime_seconds": state["uptime_seconds"]}
+
+
+@app.get("/readyz")
+async def read_readiness():
+    """Readiness: startup finished (schema, in-memory data) and the database answers"""
+    state = startup_state.snapshot()
+    if state["ready"]:
+        try:
+            await asyncio.to_thread(connection.ping)
+        except Exception as e:
+            state.update(ready=False, error=f"Banco indisponível: {e}")
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
+@app.get("/metrics/pool")
+async def read_pool_metrics():
+    """Connection pool usage: in-use/idle connections and checkout wait time"""
+    return pool_metrics.snapshot(get_request_pool())
+
+
+@app.get("/metrics/cache")
+async def read_cache_metrics():
+    """Read cache usage: entries, hit/miss counters per listing and invalidations"""
+    return read_cache.stats()
+
+
+@app.get("/metrics/sql")
+async def read_sql_metrics():
+    """SQL statements per query name: count, time, rows returned, rows affected and slow queries"""
+    return sql_metrics.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def read_prometheus_metrics():
+    """Request, pool, cache and SQL metrics in the Prometheus text format"""
+    cache = read_cache.stats()
+    lines = request_metrics.render()
+    lines += render_gauges(
+        "db_pool", pool_metrics.snapshot(get_request_pool()), "Connection pool"
+    )
+    lines += render_gauges(
+        "read_cache",
+        {key: cache[key] for key in ("entries", "evictions", "invalidations")},
+        "Read cache",
+    )
+    for counter in ("hits", "misses"):
+        lines += [
+            f"# HELP read_cache_{counter}_total Read cache {counter} per listing.",
+            f"# TYPE read_cache_{counter}_total counter",
+        ]
+        lines += [
+            f'read_cache_{counter}_total{{namespace="{namespace}"}} {stats[counter]}'
+            for namespace, stats in cache["namespaces"].items()
+        ]
+    lines += sql_metrics.render()
+    lines += render_gauges("sse", event_broadcaster.stats(), "Live event stream")
+
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
+
+
 app.include_router(router_events, prefix="/eventos", tags=["eventos"])
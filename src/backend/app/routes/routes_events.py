@@ -1,6 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
-from ..engine_database.database import SessionLocal, get_db
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from ..engine_database.database import DbSession, get_db
 from ..validator.EventValidatorSchema import (
     ValidatorEventCreate,
     ValidatorEventResponse,
@@ -15,6 +14,17 @@ from ..validator.RegisteredEventValidatorSchema import (
     ValidatorRegisteredEventCreate,
     ValidatorRegisteredEventResponse,
 )
+from ..validator.RankingValidatorSchema import ValidatorEventRankingResponse
+from ..validator.SimilarEventValidatorSchema import ValidatorSimilarEventResponse
+from ..validator.VoteValidatorSchema import (
+    ValidatorVoteBatchCreate,
+    ValidatorVoteBatchResponse,
+)
+from ..validator.ProposalValidatorSchema import (
+    ValidatorProposalCreate,
+    ValidatorProposalResponse,
+)
+from ..validator.ChangeValidatorSchema import ValidatorChangeFeedResponse
 from ..crud.create_crud import (
     create_event,
     get_all_events,
@@ -23,6 +33,7 @@ from ..crud.create_crud import (
     update_event,
     delete_event,
     register_participant,
+    register_votes,
     get_event_participants,
     get_participant_by_id,
     update_participant,
@@ -31,34 +42,185 @@ from ..crud.create_crud import (
     get_registered_events,
     get_registered_event_by_id,
     delete_registered_event,
+    create_proposal,
+    get_event_ranking,
+    get_changes,
+    get_data_version,
+    get_similar_events,
+    search_events,
+    stream_participants_export,
 )
-from typing import Dict, List
+from ..utils.DataVersion import data_version
+from ..utils.FastJson import JsonBytesResponse
+from ..utils.EventBroadcaster import event_broadcaster
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Literal, Optional
 
 router_events = APIRouter()
 
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose the cursor of the next page (keyset pagination) as a header."""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def _json_bytes(response: Response, body: bytes) -> JsonBytesResponse:
+    """
+    Serve a body serialized by the CRUD layer, keeping the headers (ETag,
+    X-Next-Cursor) already set on the route's ``response``.
+    """
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key != "content-length"
+    }
+    return JsonBytesResponse(body, headers=headers)
+
+
+async def _not_modified(
+    request: Request, response: Response, db: DbSession
+) -> Optional[Response]:
+    """
+    Set ETag/Last-Modified from the data version and return a 304 response when
+    the client already has it (If-None-Match), before the listing is queried.
+    """
+    etag, last_modified = await get_data_version(db)
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    if data_version.matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
 # ==================== EVENTS ENDPOINTS ====================
 
 
 # Rota para listar todos os eventos
 @router_events.get("/", response_model=list[ValidatorEventResponse])
-async def get_all_events_endpoint(db: Session = Depends(get_db)):
-    """Get all registered events"""
-    return await get_all_events(db)
+async def get_all_events_endpoint(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, gt=0, le=1000),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_db),
+):
+    """Get a page of registered events; the next page cursor is in X-Next-Cursor"""
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
+    events, next_cursor = await get_all_events(db, limit, cursor)
+    _set_next_cursor(response, next_cursor)
+    return _json_bytes(response, events)
 
 
 @router_events.get("/participants/unique", response_model=List[Dict[str, str]])
-async def get_unique_participants(db: Session = Depends(get_db)):
+async def get_unique_participants(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, gt=0, le=1000),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_db),
+):
     """
-    Retorna todos os participantes únicos (nomes distintos) de todos os eventos.
+    Retorna os participantes únicos (nomes distintos) de todos os eventos,
+    paginados por nome; o cursor da próxima página vem em X-Next-Cursor.
     Otimizado para evitar N+1 queries.
     """
-    return await get_all_unique_participants(db)
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
+    participants, next_cursor = await get_all_unique_participants(db, limit, cursor)
+    _set_next_cursor(response, next_cursor)
+    return _json_bytes(response, participants)
+
+
+# Rota para o ranking das ideias mais votadas
+@router_events.get("/ranking", response_model=list[ValidatorEventRankingResponse])
+async def get_event_ranking_endpoint(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, gt=0, le=1000),
+    db: DbSession = Depends(get_db),
+):
+    """Get events sorted by number of votes"""
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
+    return _json_bytes(response, await get_event_ranking(db, limit))
+
+
+# Rota para buscar ideias pelo nome (sem acentos, por prefixo das palavras)
+@router_events.get("/search", response_model=list[ValidatorEventResponse])
+async def search_events_endpoint(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, gt=0, le=100),
+    offset: int = Query(0, ge=0),
+    db: DbSession = Depends(get_db),
+):
+    """Search events by name, best ranked first"""
+    return JsonBytesResponse(await search_events(db, q, limit, offset))
+
+
+# Rota para sugerir ideias parecidas com o nome digitado (evita duplicatas)
+@router_events.get("/similar", response_model=list[ValidatorSimilarEventResponse])
+async def get_similar_events_endpoint(
+    q: str = Query(..., min_length=1, max_length=255),
+    k: int = Query(5, gt=0, le=50),
+):
+    """Get the events with names most similar to q (trigram index, no DB query)"""
+    return get_similar_events(q, k)
+
+
+# Rota do feed de alterações: tudo o que mudou depois do cursor
+@router_events.get("/changes", response_model=ValidatorChangeFeedResponse)
+async def get_changes_endpoint(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, gt=0, le=5000),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Inserted, updated and deleted events, registrations and registered events
+    after the since cursor; continue with next_cursor. 410 means the cursor
+    expired: reload the lists and continue from the cursor in the response.
+    """
+    return await get_changes(db, since, limit)
+
+
+# Rota de eventos ao vivo (Server-Sent Events): ideias e votos confirmados
+@router_events.get("/stream")
+async def stream_events_endpoint():
+    """
+    Push idea_created, vote_added, vote_removed and participant_renamed as
+    they are committed. No database access: open tabs cost no queries.
+    """
+    return StreamingResponse(
+        event_broadcaster.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Rota para exportar todos os registros de participantes (CSV ou NDJSON)
+@router_events.get("/export/{export_format}")
+async def export_participants_endpoint(
+    export_format: Literal["csv", "ndjson"], db: DbSession = Depends(get_db)
+):
+    """Stream every participant registration without loading it in memory"""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_participants_export(db, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="participants.{export_format}"'
+        },
+    )
 
 
 # Rota para criar novo evento
 @router_events.post("/", response_model=ValidatorEventResponse)
 async def create_event_endpoint(
-    event: ValidatorEventCreate, db: Session = Depends(get_db)
+    event: ValidatorEventCreate, db: DbSession = Depends(get_db)
 ):
     """Create a new event"""
     return await create_event(db, event)
@@ -67,7 +229,7 @@ async def create_event_endpoint(
 # Rota para obter evento específico
 @router_events.get("/{event_id}", response_model=ValidatorEventResponse)
 async def get_event_by_id_endpoint(
-    event_id: int = Path(..., gt=0), db: Session = Depends(get_db)
+    event_id: int = Path(..., gt=0), db: DbSession = Depends(get_db)
 ):
     """Get a specific event by ID"""
     return await get_event_by_id(db, event_id)
@@ -78,7 +240,7 @@ async def get_event_by_id_endpoint(
 async def update_event_endpoint(
     event_id: int = Path(..., gt=0),
     event_update: ValidatorEventUpdate = None,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """Update an event"""
     return await update_event(db, event_id, event_update)
@@ -87,7 +249,7 @@ async def update_event_endpoint(
 # Rota para deletar evento
 @router_events.delete("/{event_id}")
 async def delete_event_endpoint(
-    event_id: int = Path(..., gt=0), db: Session = Depends(get_db)
+    event_id: int = Path(..., gt=0), db: DbSession = Depends(get_db)
 ):
     """Delete an event"""
     return await delete_event(db, event_id)
@@ -103,20 +265,40 @@ async def delete_event_endpoint(
 async def register_participant_endpoint(
     event_id: int = Path(..., gt=0),
     participant: ValidatorParticipantCreate = None,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     return await register_participant(db, event_id, participant)
 
 
+# Registrar o voto de um participante em vários eventos de uma vez
+@router_events.post("/votes", response_model=ValidatorVoteBatchResponse)
+async def register_votes_endpoint(
+    votes: ValidatorVoteBatchCreate,
+    db: DbSession = Depends(get_db),
+):
+    """Register one participant in many events in a single transaction"""
+    return await register_votes(db, votes)
+
+
 # Listar participantes de um evento específico
 @router_events.get(
     "/{event_id}/participants", response_model=list[ValidatorParticipantResponse]
 )
 async def get_event_participants_endpoint(
+    request: Request,
+    response: Response,
     event_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, gt=0, le=1000),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_db),
 ):
-    return await get_event_participants(db, event_id)
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
+    participants, next_cursor = await get_event_participants(
+        db, event_id, limit, cursor
+    )
+    _set_next_cursor(response, next_cursor)
+    return _json_bytes(response, participants)
 
 
 # Detalhes, atualização e deleção de participantes por ID global
@@ -124,9 +306,13 @@ async def get_event_participants_endpoint(
     "/participants/{registration_id}", response_model=ValidatorParticipantResponse
 )
 async def get_participant_by_id_endpoint(
+    request: Request,
+    response: Response,
     registration_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
     return await get_participant_by_id(db, registration_id)
 
 
@@ -136,7 +322,7 @@ async def get_participant_by_id_endpoint(
 async def update_participant_endpoint(
     registration_id: int = Path(..., gt=0),
     participant_update: ValidatorParticipantUpdate = None,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     return await update_participant(db, registration_id, participant_update)
 
@@ -144,7 +330,7 @@ async def update_participant_endpoint(
 @router_events.delete("/participants/{registration_id}")
 async def delete_participant_endpoint(
     registration_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     return await delete_participant(db, registration_id)
 
@@ -158,7 +344,7 @@ async def register_event_creation_endpoint(
     event_id: int,
     event_name: str,
     created_by: str,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """Register a created event in the registered_events table"""
     return await register_event_creation(db, event_id, event_name, created_by)
@@ -168,9 +354,19 @@ async def register_event_creation_endpoint(
 @router_events.get(
     "/registered/", response_model=list[ValidatorRegisteredEventResponse]
 )
-async def get_registered_events_endpoint(db: Session = Depends(get_db)):
-    """Get all registered (created) events"""
-    return await get_registered_events(db)
+async def get_registered_events_endpoint(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, gt=0, le=1000),
+    cursor: Optional[str] = None,
+    db: DbSession = Depends(get_db),
+):
+    """Get a page of registered (created) events; next cursor in X-Next-Cursor"""
+    if not_modified := await _not_modified(request, response, db):
+        return not_modified
+    registered_events, next_cursor = await get_registered_events(db, limit, cursor)
+    _set_next_cursor(response, next_cursor)
+    return _json_bytes(response, registered_events)
 
 
 # Rota para obter um evento registrado específico
@@ -178,7 +374,7 @@ async def get_registered_events_endpoint(db: Session = Depends(get_db)):
     "/registered/{registered_event_id}", response_model=ValidatorRegisteredEventResponse
 )
 async def get_registered_event_by_id_endpoint(
-    registered_event_id: int = Path(..., gt=0), db: Session = Depends(get_db)
+    registered_event_id: int = Path(..., gt=0), db: DbSession = Depends(get_db)
 ):
     """Get a specific registered event by ID"""
     return await get_registered_event_by_id(db, registered_event_id)
@@ -187,7 +383,19 @@ async def get_registered_event_by_id_endpoint(
 # Rota para deletar um evento registrado
 @router_events.delete("/registered/{registered_event_id}")
 async def delete_registered_event_endpoint(
-    registered_event_id: int = Path(..., gt=0), db: Session = Depends(get_db)
+    registered_event_id: int = Path(..., gt=0), db: DbSession = Depends(get_db)
 ):
     """Delete a registered event"""
     return await delete_registered_event(db, registered_event_id)
+
+
+# ==================== PROPOSALS ENDPOINTS ====================
+
+
+# Rota para propor uma ideia, registrar o criador e os votos numa única transação
+@router_events.post("/proposals", response_model=ValidatorProposalResponse)
+async def create_proposal_endpoint(
+    proposal: ValidatorProposalCreate, db: DbSession = Depends(get_db)
+):
+    """Create an event, its registration and the creator's votes atomically"""
+    return await create_proposal(db, proposal)
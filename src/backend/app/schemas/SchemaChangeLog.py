@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from . import Base
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    # Cursor do GET /eventos/changes; no SQLite precisa ser INTEGER para
+    # virar o rowid autoincrementado
+    id_change = Column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    entity = Column(String(32), nullable=False)  # event, registration, ...
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(8), nullable=False)  # insert, update, delete
+    # Linha completa em JSON (formato das listagens); nula em delete
+    payload = Column(Text, nullable=True)
+    change_date = Column(DateTime(timezone=True), default=func.now(), index=True)
+
+    # Compactação: acha a alteração mais recente de cada linha
+    __table_args__ = (
+        Index("idx_change_log_entity", "entity", "entity_id", "id_change"),
+    )
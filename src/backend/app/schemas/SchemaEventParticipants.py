@@ -1,4 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.sql import func
 from . import Base
 
@@ -11,9 +18,30 @@ class EventParticipant(Base):
         Integer, ForeignKey("events.id_event"), nullable=False, index=True
     )
     participant_name = Column(String(255), nullable=False)
+    # Nome sem acentos, em minúsculas e com espaços únicos (utils/NormalizeText)
+    participant_name_normalized = Column(String(255), nullable=False)
     registration_date = Column(DateTime(timezone=True), default=func.now(), index=True)
 
-    # Constraint para garantir que cada pessoa se registra apenas uma vez por evento
+    # Índice único para garantir que cada pessoa se registra apenas uma vez por
+    # evento, comparando o nome normalizado ("João  Silva" == "joao silva")
     __table_args__ = (
-        UniqueConstraint("id_event", "participant_name", name="uq_event_participant"),
+        Index(
+            "uq_event_participant_normalized",
+            "id_event",
+            "participant_name_normalized",
+            unique=True,
+        ),
+        # Índice para a paginação por cursor
+        Index(
+            "idx_event_participants_event_date_id",
+            "id_event",
+            "registration_date",
+            "id_registration",
+        ),
+        # Cobre a lista de nomes únicos (GROUP BY do nome normalizado)
+        Index(
+            "idx_event_participants_normalized_name",
+            "participant_name_normalized",
+            "participant_name",
+        ),
     )
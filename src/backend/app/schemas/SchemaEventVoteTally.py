@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from . import Base
+
+
+class EventVoteTally(Base):
+    __tablename__ = "event_vote_tally"
+
+    # Cada evento tem vários contadores (shards) para que votos simultâneos
+    # não disputem a mesma linha; o total é a soma dos shards.
+    id_event = Column(
+        Integer,
+        ForeignKey("events.id_event", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    shard = Column(Integer, primary_key=True)
+    votes = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from . import Base
 
@@ -8,7 +8,15 @@ class Events(Base):
 
     id_event = Column(Integer, primary_key=True, index=True)
     event_name = Column(String(255), unique=True, nullable=False)
+    # Nome normalizado (utils/NormalizeText), base da busca sem acentos.
+    # No Postgres a migração adiciona ainda search_vector (tsvector + GIN).
+    event_name_normalized = Column(String(255), nullable=False)
     create_date = Column(DateTime(timezone=True), default=func.now(), index=True)
     update_date = Column(
         DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True
     )
+
+    # Índice para a paginação por cursor (create_date, id_event)
+    __table_args__ = (
+        Index("idx_events_create_date_id", "create_date", "id_event"),
+    )
@@ -1,4 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.sql import func
 from . import Base
 
@@ -15,4 +23,10 @@ class RegisteredEvent(Base):
     created_date = Column(DateTime(timezone=True), default=func.now(), index=True)
 
     # Constraint para garantir que cada evento é criado apenas uma vez
-    __table_args__ = (UniqueConstraint("id_event", name="uq_registered_event"),)
+    __table_args__ = (
+        UniqueConstraint("id_event", name="uq_registered_event"),
+        # Índice para a paginação por cursor (created_date, id_registered_event)
+        Index(
+            "idx_registered_events_date_id", "created_date", "id_registered_event"
+        ),
+    )
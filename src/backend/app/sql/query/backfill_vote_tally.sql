@@ -0,0 +1,6 @@
+INSERT INTO event_vote_tally (id_event, shard, votes)
+SELECT id_event, 0, COUNT(*)
+FROM event_participants
+WHERE NOT EXISTS (SELECT 1 FROM event_vote_tally)
+GROUP BY id_event
+ON CONFLICT (id_event, shard) DO NOTHING;
@@ -0,0 +1,12 @@
+-- Mantém só a alteração mais recente de cada linha: as anteriores são
+-- substituídas por ela (insert/update trazem a linha inteira). A mais antiga
+-- do log nunca é removida aqui, pois ela marca até onde o cursor é válido.
+DELETE FROM change_log
+WHERE id_change > (SELECT MIN(id_change) FROM change_log)
+  AND EXISTS (
+      SELECT 1
+      FROM change_log newer
+      WHERE newer.entity = change_log.entity
+        AND newer.entity_id = change_log.entity_id
+        AND newer.id_change > change_log.id_change
+  );
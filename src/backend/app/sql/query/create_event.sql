@@ -1,3 +1,3 @@
-INSERT INTO events (event_name)
-VALUES (:event_name)
+INSERT INTO events (event_name, event_name_normalized, create_date, update_date)
+VALUES (:event_name, :event_name_normalized, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
 RETURNING id_event, event_name, create_date, update_date;
@@ -0,0 +1,2 @@
+DELETE FROM change_log
+WHERE id_change <= :horizon;
@@ -1,3 +1,3 @@
 DELETE FROM event_participants
 WHERE id_registration = :id_registration
-RETURNING id_registration;
+RETURNING id_registration, id_event;
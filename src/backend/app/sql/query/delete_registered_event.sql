@@ -0,0 +1,3 @@
+DELETE FROM registered_events
+WHERE id_registered_event = :id_registered_event
+RETURNING id_registered_event;
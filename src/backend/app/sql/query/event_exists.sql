@@ -0,0 +1,3 @@
+SELECT id_event
+FROM events
+WHERE id_event = :id_event;
@@ -0,0 +1,4 @@
+SELECT p.id_registration, p.id_event, e.event_name, p.participant_name, p.registration_date
+FROM event_participants p
+JOIN events e ON e.id_event = p.id_event
+ORDER BY p.id_registration ASC;
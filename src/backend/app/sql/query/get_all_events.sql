@@ -1,3 +1,4 @@
 SELECT id_event, event_name, create_date, update_date
 FROM events
-ORDER BY create_date DESC;
+ORDER BY create_date DESC, id_event DESC
+LIMIT :limit;
@@ -0,0 +1,5 @@
+SELECT id_event, event_name, create_date, update_date
+FROM events
+WHERE (create_date, id_event) < (:cursor_date, :cursor_id)
+ORDER BY create_date DESC, id_event DESC
+LIMIT :limit;
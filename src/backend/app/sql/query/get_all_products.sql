@@ -1,2 +0,0 @@
-SELECT id_product,product_name, quantity, price, create_date, update_date FROM products
-ORDER BY create_date, update_date
@@ -0,0 +1,3 @@
+SELECT COALESCE(MIN(id_change), 0) AS first_id,
+       COALESCE(MAX(id_change), 0) AS last_id
+FROM change_log;
@@ -0,0 +1,5 @@
+SELECT id_change, entity, entity_id, operation, payload, change_date
+FROM change_log
+WHERE id_change > :since
+ORDER BY id_change
+LIMIT :limit;
@@ -0,0 +1,4 @@
+SELECT COALESCE(MAX(id_change), 0) AS settled,
+       COALESCE(MAX(id_change), 0) AS latest,
+       MAX(change_date) AS last_change
+FROM change_log;
@@ -0,0 +1,2 @@
+SELECT id_event, event_name
+FROM events;
@@ -0,0 +1,6 @@
+SELECT id_registration, id_event, participant_name, registration_date
+FROM event_participants
+WHERE id_event = :id_event
+  AND (registration_date, id_registration) < (:cursor_date, :cursor_id)
+ORDER BY registration_date DESC, id_registration DESC
+LIMIT :limit;
@@ -0,0 +1,6 @@
+SELECT e.id_event, e.event_name, COALESCE(SUM(t.votes), 0) AS votes
+FROM events e
+LEFT JOIN event_vote_tally t ON t.id_event = e.id_event
+GROUP BY e.id_event, e.event_name
+ORDER BY votes DESC, e.event_name ASC
+LIMIT :limit;
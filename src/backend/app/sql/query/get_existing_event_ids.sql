@@ -0,0 +1,4 @@
+-- expanding: event_ids
+SELECT id_event
+FROM events
+WHERE id_event IN :event_ids;
@@ -0,0 +1,3 @@
+SELECT COALESCE(MAX(id_change), 0) AS expired_id
+FROM change_log
+WHERE change_date < :cutoff;
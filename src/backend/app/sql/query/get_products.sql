@@ -1 +0,0 @@
-SELECT id_product, product_name, quantity, price, create_date, update_date FROM products WHERE id_product = :id_product
@@ -1 +0,0 @@
-SELECT quantity FROM products WHERE id_product = :id_product
@@ -0,0 +1,4 @@
+SELECT id_registered_event, id_event, event_name, created_by, created_date
+FROM registered_events
+ORDER BY created_date ASC, id_registered_event ASC
+LIMIT :limit;
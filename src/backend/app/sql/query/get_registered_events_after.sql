@@ -0,0 +1,5 @@
+SELECT id_registered_event, id_event, event_name, created_by, created_date
+FROM registered_events
+WHERE (created_date, id_registered_event) > (:cursor_date, :cursor_id)
+ORDER BY created_date ASC, id_registered_event ASC
+LIMIT :limit;
@@ -0,0 +1,6 @@
+SELECT participant_name_normalized, MIN(participant_name) AS participant_name
+FROM event_participants
+WHERE participant_name_normalized != ''
+GROUP BY participant_name_normalized
+ORDER BY participant_name_normalized ASC
+LIMIT :limit;
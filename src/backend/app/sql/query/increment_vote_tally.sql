@@ -0,0 +1,6 @@
+-- expanding: event_ids
+INSERT INTO event_vote_tally (id_event, shard, votes)
+SELECT id_event, :shard, :delta
+FROM events
+WHERE id_event IN :event_ids
+ON CONFLICT (id_event, shard) DO UPDATE SET votes = event_vote_tally.votes + excluded.votes;
@@ -0,0 +1,2 @@
+INSERT INTO change_log (entity, entity_id, operation, payload, change_date)
+VALUES (:entity, :entity_id, :operation, :payload, CURRENT_TIMESTAMP);
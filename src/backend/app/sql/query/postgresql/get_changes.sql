@@ -0,0 +1,17 @@
+-- Transações concorrentes podem confirmar ids fora de ordem: o id 10 pode
+-- aparecer antes do 9. Só entrega o prefixo de alterações inseridas há mais de
+-- :settle_seconds, para o cursor nunca passar por cima de um id ainda pendente.
+SELECT id_change, entity, entity_id, operation, payload, change_date
+FROM change_log
+WHERE id_change > :since
+  AND id_change < COALESCE(
+      (
+          SELECT MIN(id_change)
+          FROM change_log
+          WHERE id_change > :since
+            AND change_date >= clock_timestamp() - make_interval(secs => :settle_seconds)
+      ),
+      9223372036854775807
+  )
+ORDER BY id_change
+LIMIT :limit;
@@ -0,0 +1,21 @@
+-- latest muda assim que uma escrita confirma; settled só avança sobre o
+-- prefixo sem ids pendentes (mesma janela de get_changes), para que um id menor
+-- confirmado depois do maior ainda mude a versão.
+SELECT COALESCE(
+           (
+               SELECT MAX(id_change)
+               FROM change_log
+               WHERE id_change < COALESCE(
+                   (
+                       SELECT MIN(id_change)
+                       FROM change_log
+                       WHERE change_date >= clock_timestamp() - make_interval(secs => :settle_seconds)
+                   ),
+                   9223372036854775807
+               )
+           ),
+           0
+       ) AS settled,
+       COALESCE(MAX(id_change), 0) AS latest,
+       MAX(change_date) AS last_change
+FROM change_log;
@@ -0,0 +1,4 @@
+-- clock_timestamp(): hora da inserção (CURRENT_TIMESTAMP é a do início da transação),
+-- usada pelo get_changes para só entregar alterações já assentadas
+INSERT INTO change_log (entity, entity_id, operation, payload, change_date)
+VALUES (:entity, :entity_id, :operation, :payload, clock_timestamp());
@@ -0,0 +1,6 @@
+SELECT e.id_event, e.event_name, e.create_date, e.update_date,
+       ts_rank(e.search_vector, q.query) AS rank
+FROM events e, to_tsquery('simple', :tsquery) AS q(query)
+WHERE e.search_vector @@ q.query
+ORDER BY rank DESC, e.id_event ASC
+LIMIT :limit OFFSET :offset;
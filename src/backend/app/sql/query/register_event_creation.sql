@@ -0,0 +1,4 @@
+INSERT INTO registered_events (id_event, event_name, created_by, created_date)
+VALUES (:id_event, :event_name, :created_by, CURRENT_TIMESTAMP)
+ON CONFLICT (id_event) DO NOTHING
+RETURNING id_registered_event, id_event, event_name, created_by, created_date;
@@ -1,3 +1,6 @@
-INSERT INTO event_participants (id_event, participant_name)
-VALUES (:id_event, :participant_name)
+INSERT INTO event_participants (
+    id_event, participant_name, participant_name_normalized, registration_date
+)
+VALUES (:id_event, :participant_name, :participant_name_normalized, CURRENT_TIMESTAMP)
+ON CONFLICT (id_event, participant_name_normalized) DO NOTHING
 RETURNING id_registration, id_event, participant_name, registration_date;
@@ -0,0 +1,9 @@
+-- expanding: event_ids
+INSERT INTO event_participants (
+    id_event, participant_name, participant_name_normalized, registration_date
+)
+SELECT id_event, :participant_name, :participant_name_normalized, CURRENT_TIMESTAMP
+FROM events
+WHERE id_event IN :event_ids
+ON CONFLICT (id_event, participant_name_normalized) DO NOTHING
+RETURNING id_registration, id_event, participant_name, registration_date;
@@ -0,0 +1,3 @@
+SELECT id_event, event_name, event_name_normalized, create_date, update_date
+FROM events
+WHERE event_name_normalized LIKE :pattern;
@@ -1,4 +1,6 @@
 UPDATE events
 SET event_name = COALESCE(:event_name, event_name),
+    event_name_normalized = COALESCE(:event_name_normalized, event_name_normalized),
+    update_date = CURRENT_TIMESTAMP
 WHERE id_event = :id_event
 RETURNING id_event, event_name, create_date, update_date;
@@ -1,4 +1,7 @@
 UPDATE event_participants
 SET participant_name = COALESCE(:participant_name, participant_name),
+    participant_name_normalized = COALESCE(
+        :participant_name_normalized, participant_name_normalized
+    )
 WHERE id_registration = :id_registration
 RETURNING id_registration, id_event, participant_name, registration_date;
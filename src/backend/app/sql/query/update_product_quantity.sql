@@ -1 +0,0 @@
-UPDATE products SET quantity = :quantity WHERE id_product = :id_product
@@ -1,5 +1,10 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from .PoolMetrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from .SqlMetrics import sql_metrics
+import sqlite3
 import time
 import os
 from typing import Optional
@@ -10,18 +15,49 @@ class ConnectionDatabase:
     def __init__(
         self,
         base: Optional[object] = None,
-        sgdb_name: str = "postgresql",
+        sgdb_name: Optional[str] = None,
+        async_mode: Optional[bool] = None,
     ) -> None:
         self.base = base
-        self.sgdb_name = sgdb_name
         self.engine = None
+        self.async_engine = None
 
         load_dotenv()
 
-    def initialize_engine(self):
+        # DB_ENGINE=sqlite roda a API sem servidor de banco (arquivo ou memória)
+        if sgdb_name is None:
+            sgdb_name = os.getenv("DB_ENGINE", "postgresql").lower()
+        self.sgdb_name = sgdb_name
+        self.sqlite_path = os.getenv("DB_SQLITE_PATH", "youth_events.db")
+
+        # DB_ASYNC=true habilita o AsyncSession (asyncpg) nas rotas
+        if async_mode is None:
+            async_mode = os.getenv("DB_ASYNC", "false").lower() == "true"
+        if async_mode and self.sqlite_in_memory:
+            # Um engine async abriria outro banco em memória, sem as tabelas
+            print("DB_ASYNC ignorado: SQLite em memória usa apenas o modo síncrono.")
+            async_mode = False
+        self.async_mode = async_mode
+
+    @property
+    def sqlite_in_memory(self) -> bool:
+        return self.sgdb_name == "sqlite" and self.sqlite_path in ("", ":memory:")
+
+    def build_connection_string(self, driver: Optional[str] = None) -> str:
+        if self.sgdb_name == "sqlite":
+            if sqlite3.sqlite_version_info < (3, 35):
+                raise ValueError(
+                    f"SQLite {sqlite3.sqlite_version} não suporta RETURNING (>= 3.35)"
+                )
+            if self.sqlite_in_memory:
+                return f"sqlite+{driver or 'pysqlite'}://"
+            return f"sqlite+{driver or 'pysqlite'}:///{self.sqlite_path}"
+
         if self.sgdb_name != "postgresql":
             raise ValueError(f"SGBD não suportado: {self.sgdb_name}")
 
+        driver = driver or "psycopg2"
+
         # Pega as variáveis do ambiente (carregadas do .env)
         db_host = os.getenv("DB_HOST")
         db_port = os.getenv("DB_PORT")
@@ -36,20 +72,113 @@ class ConnectionDatabase:
                 "DB_USER, DB_PASSWORD e DB_NAME são requeridos"
             )
 
-        connection_string = (
-            f"postgresql+psycopg2://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-        )
+        return f"postgresql+{driver}://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+
+    def pool_options(self) -> dict:
+        """
+        Connection pool settings, configurable through the .env file.
+        """
+        return {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        }
+
+    def _configure_sqlite(self, engine) -> None:
+        """
+        SQLite only enforces foreign keys when asked to, on every connection.
+        A file database also switches to WAL, so readers do not block the
+        writer, and waits for the write lock instead of failing right away.
+        """
+        in_memory = self.sqlite_in_memory
+        busy_timeout_ms = int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", "30000"))
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragma(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            if not in_memory:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+            cursor.close()
+
+    def initialize_engine(self):
+        if self.sqlite_in_memory:
+            # Uma única conexão compartilhada: cada conexão nova seria outro banco
+            engine = create_engine(
+                self.build_connection_string(),
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+        elif self.sgdb_name == "sqlite":
+            engine = create_engine(
+                self.build_connection_string(),
+                poolclass=InstrumentedQueuePool,
+                connect_args={"check_same_thread": False},
+                **self.pool_options(),
+            )
+        else:
+            engine = create_engine(
+                self.build_connection_string(),
+                poolclass=InstrumentedQueuePool,
+                **self.pool_options(),
+            )
+            sql_metrics.instrument(engine)
+            return engine
+
+        self._configure_sqlite(engine)
+        sql_metrics.instrument(engine)
+        return engine
+
+    def initialize_async_engine(self):
+        """
+        Create the asyncio engine used by the AsyncSession mode
+        (asyncpg, or aiosqlite with DB_ENGINE=sqlite).
+        """
+        if self.sgdb_name == "sqlite":
+            async_engine = create_async_engine(
+                self.build_connection_string(driver="aiosqlite"),
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                **self.pool_options(),
+            )
+            self._configure_sqlite(async_engine.sync_engine)
+        else:
+            async_engine = create_async_engine(
+                self.build_connection_string(driver="asyncpg"),
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                **self.pool_options(),
+            )
+
+        sql_metrics.instrument(async_engine.sync_engine)
+        return async_engine
 
-        return create_engine(connection_string)
+    def create_engines(self):
+        """
+        Build the sync (and, with DB_ASYNC, the async) engine. No connection
+        is opened here: the pool connects on the first checkout.
+        """
+        self.engine = self.initialize_engine()
+        if self.async_mode:
+            self.async_engine = self.initialize_async_engine()
+        return self.engine
+
+    def ping(self) -> None:
+        """
+        Run ``SELECT 1``; raises OperationalError when the database is down.
+        """
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
 
     def connect(self, max_retries: int = 5, wait_seconds: int = 2):
         for attempt in range(1, max_retries + 1):
             try:
-                self.engine = self.initialize_engine()
-
-                with self.engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
+                self.create_engines()
+                self.ping()
                 print("Conexão com o banco de dados estabelecida com sucesso!")
+                if self.async_mode:
+                    print("Modo assíncrono habilitado.")
                 return self.engine
 
             except OperationalError as e:
@@ -60,7 +189,18 @@ class ConnectionDatabase:
                     )
                 time.sleep(wait_seconds)
 
-    def create_schema(self, max_retries: int = 5, wait_seconds: int = 2):
+    def create_missing_indexes(self):
+        """
+        create_all only builds indexes together with new tables; create the
+        indexes added to the models after the tables already existed.
+        """
+        for table in self.base.metadata.sorted_tables:  # pyright: ignore[reportAttributeAccessIssue]
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+
+    def create_schema(
+        self, max_retries: int = 5, wait_seconds: int = 2, migrate=None
+    ):
         if self.base is None:
             raise ValueError("Modelo base (declarative_base) não foi fornecido")
         if self.engine is None:
@@ -69,6 +209,9 @@ class ConnectionDatabase:
         for attempt in range(1, max_retries + 1):
             try:
                 self.base.metadata.create_all(bind=self.engine)  # pyright: ignore[reportAttributeAccessIssue]
+                if migrate is not None:
+                    migrate(self.engine)  # Atualiza tabelas de versões anteriores
+                self.create_missing_indexes()
                 print("Esquema criado com sucesso!")
                 return
             except OperationalError as e:
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from threading import Lock
+from typing import Optional
+
+
+class DataVersion:
+    """
+    Validators for conditional GETs, derived from the change log.
+
+    The version is read from the database on every conditional GET (the
+    newest ``change_log`` id, see ``crud.get_data_version``), so every worker
+    hands out the same ETag for the same data and a write made by any worker
+    changes it. ``observe`` tells when the version moved since this process
+    last saw it, so its in-process read cache can be dropped.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._seen: Optional[tuple[int, int]] = None
+
+    def observe(self, settled: int, latest: int) -> bool:
+        """
+        Record the version read from the database; return True when it differs
+        from the previous one seen by this process.
+        """
+        with self._lock:
+            moved = self._seen != (settled, latest)
+            self._seen = (settled, latest)
+            return moved
+
+    @staticmethod
+    def validators(
+        settled: int, latest: int, last_change: datetime | str | None
+    ) -> tuple[str, Optional[str]]:
+        """
+        Return the ``(ETag, Last-Modified)`` header values of a version
+        (Last-Modified is None while the change log is empty).
+        """
+        if last_change is None:
+            return f'"{settled}-{latest}"', None
+        if isinstance(last_change, str):
+            # SQLite devolve CURRENT_TIMESTAMP (UTC) como texto, sem fuso
+            last_change = datetime.fromisoformat(last_change)
+        if last_change.tzinfo is None:
+            last_change = last_change.replace(tzinfo=timezone.utc)
+        return (
+            f'"{settled}-{latest}"',
+            format_datetime(last_change.replace(microsecond=0), usegmt=True),
+        )
+
+    @staticmethod
+    def matches(if_none_match: str | None, etag: str) -> bool:
+        """
+        Tell whether an ``If-None-Match`` header matches ``etag`` (weak comparison).
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+
+        return etag in (
+            candidate.strip().removeprefix("W/")
+            for candidate in if_none_match.split(",")
+        )
+
+
+data_version = DataVersion()
@@ -0,0 +1,121 @@
+from dotenv import load_dotenv
+from threading import Lock
+from typing import AsyncIterator
+import asyncio
+import json
+import os
+
+
+class _Subscriber:
+    __slots__ = ("queue", "loop", "dropped")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.loop = loop
+        self.dropped = False
+
+
+class EventBroadcaster:
+    """
+    Fan-out of committed changes to the open ``/eventos/stream`` connections.
+
+    Each subscriber has its own bounded queue. ``publish`` never waits: a
+    subscriber whose queue is full is disconnected (its EventSource reconnects
+    and reloads the listings) instead of slowing down the writes or the
+    other subscribers.
+    """
+
+    def __init__(self, max_queue: int = 100, heartbeat_seconds: float = 15) -> None:
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self._lock = Lock()
+        self._subscribers: set[_Subscriber] = set()
+        self._sequence = 0
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, event_type: str, data: dict) -> None:
+        """
+        Queue an event for every subscriber. Safe to call from any thread.
+        """
+        with self._lock:
+            self._sequence += 1
+            self.published += 1
+            message = (
+                f"id: {self._sequence}\n"
+                f"event: {event_type}\n"
+                f"data: {json.dumps(data, default=str)}\n\n"
+            )
+            subscribers = list(self._subscribers)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscriber in subscribers:
+            if running is subscriber.loop:
+                self._offer(subscriber, message)
+                continue
+            try:
+                subscriber.loop.call_soon_threadsafe(self._offer, subscriber, message)
+            except RuntimeError:  # loop já encerrado
+                with self._lock:
+                    self._subscribers.discard(subscriber)
+
+    def _offer(self, subscriber: _Subscriber, message: str) -> None:
+        if subscriber.dropped:
+            return
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Consumidor lento: descarta a fila e avisa que a conexão será fechada
+            subscriber.dropped = True
+            with self._lock:
+                self._subscribers.discard(subscriber)
+                self.dropped += 1
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(None)
+
+    async def stream(self) -> AsyncIterator[str]:
+        """
+        Yield the messages of a new subscription in the SSE format, with a
+        comment line as heartbeat when nothing happens (keeps proxies from
+        closing the connection). The subscription ends with the generator.
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), self.heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if message is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    return
+                yield message
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+load_dotenv()
+
+event_broadcaster = EventBroadcaster(
+    max_queue=int(os.getenv("SSE_QUEUE_SIZE", "100")),
+    heartbeat_seconds=float(os.getenv("SSE_HEARTBEAT_SECONDS", "15")),
+)
@@ -0,0 +1,38 @@
+from fastapi import Response
+from functools import lru_cache
+from pydantic import TypeAdapter
+from typing import Any, Iterable
+
+
+@lru_cache(maxsize=None)
+def list_adapter(item_type: Any) -> TypeAdapter:
+    """
+    ``TypeAdapter(list[item_type])``, built once per type: the validator and
+    serializer are compiled on the first call only.
+    """
+    return TypeAdapter(list[item_type])
+
+
+def dump_rows(item_type: Any, rows: Iterable) -> bytes:
+    """
+    Validate a whole result set against ``item_type`` in one call (rows may be
+    SQLAlchemy rows or dicts) and return it as JSON bytes.
+    """
+    rows = list(rows)
+    if rows and hasattr(rows[0], "_fields"):
+        # Ler Row por atributo custa mais que montar o dict a partir da tupla
+        keys = rows[0]._fields
+        rows = [dict(zip(keys, row)) for row in rows]
+
+    adapter = list_adapter(item_type)
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+class JsonBytesResponse(Response):
+    """
+    Response for bodies already serialized by ``dump_rows``. Returning it
+    skips the response_model validation and the jsonable_encoder pass of
+    FastAPI; the route keeps response_model for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
@@ -0,0 +1,49 @@
+from datetime import datetime
+import base64
+import json
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    Datetimes are stored in ISO format.
+    """
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor created by ``encode_cursor`` with ``size`` values.
+    Raises ValueError when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+    try:
+        return [_decode_value(value) for value in payload]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+
+def _decode_value(value):
+    # Só os tipos que encode_cursor produz: str, int ou {"dt": "<ISO>"}
+    if isinstance(value, dict):
+        if set(value) != {"dt"} or not isinstance(value["dt"], str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value["dt"])
+    if isinstance(value, str) or (
+        isinstance(value, int) and not isinstance(value, bool)
+    ):
+        return value
+    raise TypeError(value)
@@ -0,0 +1,197 @@
+from bisect import bisect_left
+from threading import Lock
+import time
+
+# Limites dos buckets (segundos / bytes), no formato cumulativo do Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; ``observe`` is a bisect and two additions.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """
+    Request counters kept per route template (``/eventos/{event_id}``), so
+    the number of series does not grow with the ids in the URLs.
+    The in-flight gauge is per method: the route is only known once the
+    router has handled the request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.size: dict[tuple[str, str], Histogram] = {}
+        self.status: dict[tuple[str, str, int], int] = {}
+        self.in_flight: dict[str, int] = {}
+
+    def request_started(self, method: str) -> None:
+        with self._lock:
+            self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def request_finished(
+        self, method: str, route: str, status: int, seconds: float, size: int
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            self.in_flight[method] -= 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.size[key] = Histogram(SIZE_BUCKETS)
+            self.latency[key].observe(seconds)
+            self.size[key].observe(size)
+            status_key = (method, route, status)
+            self.status[status_key] = self.status.get(status_key, 0) + 1
+
+    def render(self) -> list[str]:
+        """
+        Return the request metrics in the Prometheus text format.
+        """
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Requests by route template and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.status.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",'
+                    f'route="{escape_label(route)}",status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP http_requests_in_flight Requests being processed.",
+                "# TYPE http_requests_in_flight gauge",
+            ]
+            for method, count in sorted(self.in_flight.items()):
+                lines.append(f'http_requests_in_flight{{method="{method}"}} {count}')
+
+            for name, help_text, histograms in (
+                (
+                    "http_request_duration_seconds",
+                    "Time until the last byte of the response was sent.",
+                    self.latency,
+                ),
+                (
+                    "http_response_size_bytes",
+                    "Size of the response body.",
+                    self.size,
+                ),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    labels = f'method="{method}",route="{escape_label(route)}"'
+                    lines += histogram.render(name, labels)
+
+            return lines
+
+
+def render_gauges(prefix: str, values: dict, help_text: str) -> list[str]:
+    """
+    Render the numeric values of ``values`` as ``<prefix>_<key>`` gauges.
+    """
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines += [
+            f"# HELP {name} {help_text} ({key}).",
+            f"# TYPE {name} gauge",
+            f"{name} {value}",
+        ]
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding ``request_metrics``.
+
+    Unlike ``BaseHTTPMiddleware`` it does not wrap the request and response
+    in extra tasks and streams, so it is cheap enough to stay on in production.
+    The route template comes from the route the router stored in the scope.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    @staticmethod
+    def _route_template(scope) -> str:
+        route = scope.get("route")
+        template = getattr(route, "path", None)
+        if template is None:
+            return "unmatched"
+
+        # Conforme a versão do FastAPI, route.path pode vir sem o prefixo do
+        # include_router: recupera o prefixo a partir do caminho concreto
+        try:
+            concrete = route.path_format.format(**scope.get("path_params", {}))
+        except (AttributeError, KeyError, IndexError, ValueError):
+            return template
+        path = scope["path"]
+        if concrete and path.endswith(concrete):
+            return path[: len(path) - len(concrete)] + template
+        return template
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        request_metrics.request_started(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.request_finished(
+                method,
+                self._route_template(scope),
+                status,
+                time.perf_counter() - start,
+                size,
+            )
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,104 @@
+from collections import Counter
+from threading import Lock
+from typing import Iterable
+from .NormalizeText import normalize_text
+
+
+class NgramIndex:
+    """
+    In-memory inverted index of character n-grams (trigrams by default).
+
+    Texts are normalized (utils/NormalizeText) and padded with spaces, so
+    "Boliche" and "boliche com pizza" share the n-grams of "boliche". A search
+    only visits the documents that share at least one n-gram with the query
+    and ranks them by the Dice coefficient of their n-gram sets.
+    The index lives in the process; each worker keeps its own copy.
+    """
+
+    def __init__(self, n: int = 3) -> None:
+        self.n = n
+        self._lock = Lock()
+        self._documents: dict[int, tuple[str, frozenset[str]]] = {}
+        self._postings: dict[str, set[int]] = {}
+
+    def ngrams(self, text: str) -> frozenset[str]:
+        normalized = normalize_text(text)
+        if not normalized:
+            return frozenset()
+
+        padded = f"{' ' * (self.n - 1)}{normalized} "
+        return frozenset(
+            padded[i : i + self.n] for i in range(len(padded) - self.n + 1)
+        )
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def rebuild(self, documents: Iterable[tuple[int, str]]) -> None:
+        """
+        Replace the whole index with ``(id, text)`` pairs.
+        """
+        indexed = {doc_id: (text, self.ngrams(text)) for doc_id, text in documents}
+        postings: dict[str, set[int]] = {}
+        for doc_id, (_, grams) in indexed.items():
+            for gram in grams:
+                postings.setdefault(gram, set()).add(doc_id)
+
+        with self._lock:
+            self._documents = indexed
+            self._postings = postings
+
+    def add(self, doc_id: int, text: str) -> None:
+        """
+        Index ``text`` under ``doc_id``, replacing the previous text if any.
+        """
+        grams = self.ngrams(text)
+        with self._lock:
+            self._remove(doc_id)
+            self._documents[doc_id] = (text, grams)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: int) -> None:
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+
+        for gram in document[1]:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(
+        self, query: str, k: int = 5, min_score: float = 0.0
+    ) -> list[tuple[int, str, float]]:
+        """
+        Return up to ``k`` ``(id, text, score)`` tuples, best match first.
+        """
+        grams = self.ngrams(query)
+        if not grams:
+            return []
+
+        with self._lock:
+            shared: Counter[int] = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+
+            results = []
+            for doc_id, count in shared.items():
+                text, doc_grams = self._documents[doc_id]
+                score = 2 * count / (len(grams) + len(doc_grams))
+                if score >= min_score:
+                    results.append((doc_id, text, round(score, 4)))
+
+        results.sort(key=lambda result: (-result[2], result[0]))
+        return results[:k]
+
+
+event_name_index = NgramIndex()
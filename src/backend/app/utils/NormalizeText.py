@@ -0,0 +1,15 @@
+import re
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """
+    Casefold, strip accents and collapse whitespace.
+    Same rules as ``normalizar_texto`` in the frontend, so both sides agree on
+    when two names are the same person. Only combining marks are dropped:
+    letters of any script are kept ("Øyvind" != "yvind", "Иван" stays "иван").
+    """
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))  # Remove acentos
+    text = re.sub(r"\s+", " ", text)  # Substitui múltiplos espaços por um só
+    return text.strip()
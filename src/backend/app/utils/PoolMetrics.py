@@ -0,0 +1,80 @@
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from threading import Lock
+import time
+
+
+class PoolMetrics:
+    """
+    Counters about connection checkouts, shared by the instrumented pools.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.in_use_max = 0
+
+    def record_checkout(self, wait_seconds: float, in_use: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self.in_use_max = max(self.in_use_max, in_use)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        """
+        Return the counters together with the current state of ``pool``.
+        """
+        # Pools sem fila (StaticPool do SQLite em memória) não têm esses contadores
+        if not isinstance(pool, QueuePool):
+            return {"pool_class": type(pool).__name__}
+
+        with self._lock:
+            wait_avg = self.wait_seconds_total / self.checkouts if self.checkouts else 0
+            return {
+                "pool_size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "in_use_max": self.in_use_max,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(wait_avg, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _InstrumentedPoolMixin:
+    """
+    Time how long each checkout waits for a connection (including the time
+    spent opening a new one when the pool grows).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
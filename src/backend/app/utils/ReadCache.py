@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+import os
+import time
+from dotenv import load_dotenv
+
+MISSING = object()
+
+
+class ReadCache:
+    """
+    In-process LRU cache with a TTL per entry, used by the hot read endpoints.
+
+    Entries are grouped in namespaces (one per listing) so a write can drop
+    exactly the listings it affected. Each namespace has a generation number
+    bumped on invalidation: a value loaded before an invalidation is not
+    stored, which keeps a slow read from caching stale data after a write.
+    The cache is per process; with several workers each one keeps its own.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """
+        Return the cached value or ``MISSING``.
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[(namespace, key)]
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+                return MISSING
+
+            self._entries.move_to_end((namespace, key))
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+            return entry[1]
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def set(
+        self, namespace: str, key: Hashable, value: Any, generation: int | None = None
+    ) -> None:
+        """
+        Store ``value`` unless the namespace was invalidated after
+        ``generation`` was read.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generations.get(
+                namespace, 0
+            ):
+                return
+
+            self._entries[(namespace, key)] = (
+                time.monotonic() + self.ttl_seconds,
+                value,
+            )
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Drop every entry of ``namespaces``.
+        """
+        if not namespaces:
+            return
+
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for cache_key in [k for k in self._entries if k[0] in namespaces]:
+                del self._entries[cache_key]
+            self.invalidations += len(namespaces)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = sorted(set(self.hits) | set(self.misses))
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "namespaces": {
+                    namespace: {
+                        "hits": self.hits.get(namespace, 0),
+                        "misses": self.misses.get(namespace, 0),
+                    }
+                    for namespace in namespaces
+                },
+            }
+
+
+load_dotenv()
+
+read_cache = ReadCache(
+    max_entries=int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("READ_CACHE_TTL_SECONDS", "30")),
+)
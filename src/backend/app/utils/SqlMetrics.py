@@ -0,0 +1,162 @@
+from dotenv import load_dotenv
+from sqlalchemy import event
+from threading import Lock
+from .Metrics import LATENCY_BUCKETS, Histogram, escape_label
+import logging
+import os
+import time
+
+logger = logging.getLogger("backend.sql")
+
+
+def redact_parameters(parameters) -> object:
+    """
+    Replace bound values by their type (and length for lists), keeping the
+    parameter names: enough to read a slow query without leaking names.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return f"<{type(parameters).__name__}[{len(parameters)}]>"
+    return f"<{type(parameters).__name__}>"
+
+
+class SqlMetrics:
+    """
+    Timing of every SQL statement, grouped by its logical name.
+
+    The name is the ``query_name`` execution option: the ``sql/query`` file
+    name for statements of the registry, or the name set explicitly on an
+    inline ``select()``. Anything else (DDL, migrations) is grouped as
+    ``unnamed``. Statements slower than ``slow_query_ms`` are logged with
+    their parameters redacted.
+
+    Two row counters are kept. Rows returned are the rows fetched by the
+    application (SELECT and RETURNING), reported by the CRUD layer through
+    ``add_rows_returned`` since the driver's rowcount is -1 or 0 for them on
+    several drivers. Rows affected come from rowcount for the statements
+    that return no rows (INSERT, UPDATE and DELETE without RETURNING).
+    """
+
+    def __init__(self, slow_query_ms: float = 500) -> None:
+        self.slow_query_ms = slow_query_ms
+        self._lock = Lock()
+        self.latency: dict[str, Histogram] = {}
+        self.rows_affected: dict[str, int] = {}
+        self.rows_returned: dict[str, int] = {}
+        self.slow: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            if name not in self.latency:
+                self.latency[name] = Histogram(LATENCY_BUCKETS)
+                self.rows_affected[name] = 0
+                self.rows_returned[name] = 0
+                self.slow[name] = 0
+            self.latency[name].observe(seconds)
+            if rows > 0:
+                self.rows_affected[name] += rows
+            if self.slow_query_ms and seconds * 1000 >= self.slow_query_ms:
+                self.slow[name] += 1
+
+    def add_rows_returned(self, name: str, rows: int) -> None:
+        with self._lock:
+            self.rows_returned[name] = self.rows_returned.get(name, 0) + rows
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "count": histogram.count,
+                    "seconds_total": round(histogram.sum, 6),
+                    "seconds_avg": round(histogram.sum / histogram.count, 6),
+                    "rows_returned": self.rows_returned.get(name, 0),
+                    "rows_affected": self.rows_affected[name],
+                    "slow": self.slow[name],
+                }
+                for name, histogram in sorted(self.latency.items())
+            }
+
+    def render(self) -> list[str]:
+        """
+        Return the per-query metrics in the Prometheus text format.
+        """
+        with self._lock:
+            lines = [
+                "# HELP sql_query_duration_seconds Statement execution time by query.",
+                "# TYPE sql_query_duration_seconds histogram",
+            ]
+            for name, histogram in sorted(self.latency.items()):
+                lines += histogram.render(
+                    "sql_query_duration_seconds", f'query="{escape_label(name)}"'
+                )
+
+            for metric, help_text, values in (
+                (
+                    "sql_rows_returned_total",
+                    "Rows fetched by the application.",
+                    self.rows_returned,
+                ),
+                (
+                    "sql_rows_affected_total",
+                    "Rows written by statements without RETURNING.",
+                    self.rows_affected,
+                ),
+                ("sql_slow_queries_total", "Statements over the limit.", self.slow),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                lines += [
+                    f'{metric}{{query="{escape_label(name)}"}} {value}'
+                    for name, value in sorted(values.items())
+                ]
+            return lines
+
+    def instrument(self, engine) -> None:
+        """
+        Listen to the cursor events of a (sync) engine. For an AsyncEngine
+        pass ``async_engine.sync_engine``.
+        """
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            seconds = time.perf_counter() - conn.info["query_start"].pop()
+            name = (
+                context.execution_options.get("query_name", "unnamed")
+                if context is not None
+                else "unnamed"
+            )
+            # rowcount só é confiável sem linhas de retorno (SELECT/RETURNING)
+            rows = cursor.rowcount if cursor.description is None else 0
+            self.record(name, seconds, rows)
+
+            if self.slow_query_ms and seconds * 1000 >= self.slow_query_ms:
+                logger.warning(
+                    "Slow query %s: %.1f ms\n%s\nparameters: %s",
+                    name,
+                    seconds * 1000,
+                    statement,
+                    redact_parameters(parameters),
+                )
+
+        @event.listens_for(engine, "handle_error")
+        def _handle_error(exception_context):
+            # Sem after_cursor_execute: descarta o início registrado
+            conn = exception_context.connection
+            if conn is not None and conn.info.get("query_start"):
+                conn.info["query_start"].pop()
+
+
+load_dotenv()
+
+# SQL_SLOW_QUERY_MS=0 desliga o log de queries lentas
+sql_metrics = SqlMetrics(slow_query_ms=float(os.getenv("SQL_SLOW_QUERY_MS", "500")))
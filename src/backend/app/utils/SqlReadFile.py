@@ -1,5 +1,4 @@
 from pathlib import Path
-import pandas as pd
 from ..utils.ConnectionDatabaseSql import ConnectionDatabase
 from sqlalchemy import text
 
@@ -31,25 +30,33 @@ class SqlReadFile:
 
         return self.query
 
-    def execute_query_sql(self, params: dict = None):
+    def execute_query_sql(self, params: dict = None, connection=None):
         """
-        Execute the SQL query and return the result as a DataFrame.
+        Execute the SQL query and return the result rows.
+        Pass the request's session/connection as ``connection`` to avoid
+        checking out a second connection from the pool.
         """
         if not self.query:
             raise ValueError("Query is empty. Please read the SQL file first.")
 
+        if connection is not None:
+            return self._execute(connection, params)
+
         with self.engine.connect() as connection:
-            try:
-                result = connection.execute(text(self.query), params or {})
-                if result.returns_rows:
-                    self.data = result.fetchall()
-                    self.columns = result.keys()
-                    return self.data
-                else:
-                    # Quando for um INSERT, UPDATE, etc.
-                    return {"rowcount": result.rowcount}
-            except Exception as e:
-                raise RuntimeError(f"Error executing query: {e}")
+            return self._execute(connection, params)
+
+    def _execute(self, connection, params: dict = None):
+        try:
+            result = connection.execute(text(self.query), params or {})
+            if result.returns_rows:
+                self.data = result.fetchall()
+                self.columns = result.keys()
+                return self.data
+            else:
+                # Quando for um INSERT, UPDATE, etc.
+                return {"rowcount": result.rowcount}
+        except Exception as e:
+            raise RuntimeError(f"Error executing query: {e}")
 
     def query_to_dataframe(self):
         """
@@ -60,5 +67,7 @@ class SqlReadFile:
         if not self.columns:
             raise ValueError("Columns are missing. Please execute the query first.")
 
+        import pandas as pd  # importado só aqui: pesado e fora do caminho das rotas
+
         self.df = pd.DataFrame(self.data, columns=self.columns)
         return self.df
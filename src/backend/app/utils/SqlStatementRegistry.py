@@ -0,0 +1,117 @@
+from pathlib import Path
+from threading import Lock
+import os
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+
+
+class SqlStatementRegistry:
+    """
+    Registry of the SQL statements stored in ``sql/query``.
+
+    Every ``.sql`` file is read and wrapped in ``text()`` once, when the
+    registry is created, and exposed by its file name (without extension).
+    A ``-- expanding: name, ...`` header line marks parameters bound to a list
+    (``WHERE id IN :name``).
+    Files in ``sql/query/<dialect>/`` (e.g. ``postgresql``, ``sqlite``) replace
+    or complement the portable ones for that database only.
+    With ``hot_reload`` enabled the file modification time is checked on each
+    lookup and the statement is recompiled when the file changes (dev only).
+    """
+
+    def __init__(
+        self, query_dir: Path, hot_reload: bool = False, dialect: str | None = None
+    ) -> None:
+        self.query_dir = query_dir
+        self.hot_reload = hot_reload
+        self.dialect = dialect
+        self.statements: dict[str, TextClause] = {}
+        self.paths: dict[str, Path] = {}
+        self.mtimes: dict[str, float] = {}
+        self._lock = Lock()
+
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load and compile every SQL file of the query directory.
+        """
+        if not self.query_dir.is_dir():
+            raise FileNotFoundError(f"SQL directory '{self.query_dir}' not found.")
+
+        with self._lock:
+            for path in sorted(self.query_dir.glob("*.sql")):
+                self._load_file(path)
+
+            # Versões específicas do banco substituem as portáveis
+            if self.dialect:
+                for path in sorted(self.query_dir.joinpath(self.dialect).glob("*.sql")):
+                    self._load_file(path)
+
+    def _load_file(self, path: Path) -> None:
+        with open(path, "r") as file:
+            query = file.read()
+
+        # query_name identifica o arquivo nas métricas de SQL (utils/SqlMetrics)
+        statement = text(query).execution_options(query_name=path.stem)
+        expanding = self._expanding_params(query)
+        if expanding:
+            statement = statement.bindparams(
+                *[bindparam(name, expanding=True) for name in expanding]
+            )
+
+        self.statements[path.stem] = statement
+        self.paths[path.stem] = path
+        self.mtimes[path.stem] = path.stat().st_mtime
+
+    @staticmethod
+    def _expanding_params(query: str) -> list[str]:
+        names: list[str] = []
+        for line in query.splitlines():
+            line = line.strip()
+            if line.startswith("-- expanding:"):
+                names += [
+                    name.strip()
+                    for name in line.removeprefix("-- expanding:").split(",")
+                    if name.strip()
+                ]
+        return names
+
+    def _reload_if_changed(self, name: str) -> None:
+        path = self.paths.get(name)
+        if path is None or not path.is_file():
+            return
+
+        if path.stat().st_mtime != self.mtimes.get(name):
+            with self._lock:
+                self._load_file(path)
+
+    def get(self, name: str) -> TextClause:
+        """
+        Return the compiled statement registered under ``name``.
+        """
+        if self.hot_reload:
+            self._reload_if_changed(name)
+
+        try:
+            return self.statements[name]
+        except KeyError:
+            raise FileNotFoundError(
+                f"SQL file '{self.query_dir.joinpath(f'{name}.sql')}' not found."
+            )
+
+    def names(self) -> list[str]:
+        """
+        Return the names of all registered statements.
+        """
+        return sorted(self.statements)
+
+
+load_dotenv()
+
+sql_statements = SqlStatementRegistry(
+    query_dir=Path(__file__).parent.parent.joinpath("sql", "query"),
+    hot_reload=os.getenv("SQL_HOT_RELOAD", "false").lower() == "true",
+    dialect=os.getenv("DB_ENGINE", "postgresql").lower(),
+)
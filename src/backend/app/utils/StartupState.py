@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from threading import Lock
+import time
+
+
+class StartupState:
+    """
+    Startup progress of the API, read by ``/healthz`` and ``/readyz``.
+
+    ``mark`` records the time since the previous mark, so the phases
+    (imports, connection, schema, ...) add up to the total startup time.
+    ``set_failed`` is a transient error (startup keeps retrying);
+    ``set_fatal`` means startup gave up, and ``/healthz`` then fails too so
+    the process gets restarted instead of staying not-ready forever.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self.phases: dict[str, float] = {}
+        self.attempts = 0
+        self.ready = False
+        self.fatal = False
+        self.error: str | None = None
+
+    def mark(self, phase: str) -> float:
+        with self._lock:
+            now = time.perf_counter()
+            seconds = now - self._last_mark
+            self._last_mark = now
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        return seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block as ``name``; the wait before it is not counted.
+        """
+        with self._lock:
+            self._last_mark = time.perf_counter()
+        yield
+        self.mark(name)
+
+    def set_ready(self) -> None:
+        with self._lock:
+            self.ready = True
+            self.error = None
+        print(
+            f"API pronta em {time.perf_counter() - self.started:.2f}s: "
+            + ", ".join(f"{name}={sec:.3f}s" for name, sec in self.phases.items())
+        )
+
+    def set_failed(self, error: str) -> None:
+        with self._lock:
+            self.ready = False
+            self.error = error
+
+    def set_fatal(self, error: str) -> None:
+        with self._lock:
+            self.ready = False
+            self.fatal = True
+            self.error = error
+        print(f"Inicialização abortada: {error}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "fatal": self.fatal,
+                "error": self.error,
+                "attempts": self.attempts,
+                "uptime_seconds": round(time.perf_counter() - self.started, 3),
+                "phases_seconds": {
+                    name: round(seconds, 4) for name, seconds in self.phases.items()
+                },
+            }
+
+
+startup_state = StartupState()
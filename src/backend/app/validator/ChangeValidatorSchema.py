@@ -0,0 +1,26 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+
+
+class ValidatorChangeResponse(BaseModel):
+    """Validator for one entry of the change feed"""
+
+    id_change: int
+    entity: Literal["event", "registration", "registered_event"]
+    entity_id: int
+    operation: Literal["insert", "update", "delete"]
+    # Linha completa (como nas listagens) em insert/update; nula em delete
+    data: Optional[Dict[str, Any]] = None
+    change_date: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ValidatorChangeFeedResponse(BaseModel):
+    """Validator for a page of the change feed"""
+
+    changes: List[ValidatorChangeResponse]
+    next_cursor: int
+    has_more: bool
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import List
+from .EventValidatorSchema import ValidatorEventResponse
+from .RegisteredEventValidatorSchema import ValidatorRegisteredEventResponse
+from .VoteValidatorSchema import ValidatorVoteBatchResponse
+
+
+class ValidatorProposalCreate(BaseModel):
+    """Validator for proposing an idea, voting on it and on other ideas"""
+
+    event_name: str = Field(..., min_length=1, max_length=255, description="Event name")
+    created_by: str = Field(..., min_length=1, max_length=255, description="Creator")
+    event_ids: List[int] = Field(
+        default_factory=list, max_length=200, description="Extra events to vote on"
+    )
+
+
+class ValidatorProposalResponse(BaseModel):
+    """Validator for proposal response"""
+
+    event: ValidatorEventResponse
+    registered_event: ValidatorRegisteredEventResponse
+    votes: ValidatorVoteBatchResponse
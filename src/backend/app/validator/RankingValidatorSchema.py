@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ValidatorEventRankingResponse(BaseModel):
+    """Validator for an event and its vote count"""
+
+    id_event: int
+    event_name: str
+    votes: int
+
+    class Config:
+        from_attributes = True
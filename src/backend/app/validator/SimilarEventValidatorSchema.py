@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ValidatorSimilarEventResponse(BaseModel):
+    """Validator for an event whose name is similar to a search text"""
+
+    id_event: int
+    event_name: str
+    score: float
+
+    class Config:
+        from_attributes = True
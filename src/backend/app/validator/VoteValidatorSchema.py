@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class ValidatorVoteBatchCreate(BaseModel):
+    """Validator for registering one participant in many events at once"""
+
+    participant_name: str = Field(
+        ..., min_length=1, max_length=255, description="Participant name"
+    )
+    event_ids: List[int] = Field(
+        ..., min_length=1, max_length=200, description="Events to vote on"
+    )
+
+
+class ValidatorVoteResult(BaseModel):
+    """Validator for the outcome of a single vote in a batch"""
+
+    id_event: int
+    status: Literal["created", "duplicate", "missing"]
+    id_registration: Optional[int] = None
+
+
+class ValidatorVoteBatchResponse(BaseModel):
+    """Validator for batch vote response"""
+
+    participant_name: str
+    results: List[ValidatorVoteResult]
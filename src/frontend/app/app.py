@@ -2,6 +2,9 @@ import time
 import streamlit as st
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from utils.NormalizeText import normalizar_texto
 
 # ==================== CONFIGURAÇÃO DA PÁGINA ====================
 st.set_page_config(
@@ -9,18 +12,71 @@ st.set_page_config(
 )
 API_URL = st.secrets.get("api_base_url", "http://localhost:8000") + "/eventos"
 
+# Status devolvidos pela API para cada voto -> status exibidos na interface
+STATUS_VOTOS = {
+    "created": "sucesso",
+    "duplicate": "duplicado",
+    "missing": "inexistente",
+}
+
+# Requisições simultâneas à API (votos enviados um a um) e conexões mantidas abertas
+MAX_REQUISICOES_PARALELAS = 4
+
 st.header("🎯 Formulário de Registro de Ideia de Eventos Jovens AduPno")
 st.divider()
 
 
 # ==================== FUNÇÕES AUXILIARES ====================
+@st.cache_resource
+def cliente_http() -> requests.Session:
+    """
+    Sessão HTTP compartilhada entre os reruns e usuários do app: reaproveita as
+    conexões (keep-alive) em vez de abrir uma conexão TCP/TLS por chamada.
+    """
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(
+        pool_connections=1, pool_maxsize=MAX_REQUISICOES_PARALELAS * 2
+    )
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+def buscar_todas_paginas(url: str) -> list:
+    """
+    Busca todas as páginas de uma listagem seguindo o cabeçalho X-Next-Cursor.
+    O ETag da primeira página é guardado na sessão e reenviado em If-None-Match:
+    se a API responder 304, nada mudou e a lista já buscada é reaproveitada.
+    """
+    if "etags" not in st.session_state:
+        st.session_state.etags = {}
+    etag, itens_em_cache = st.session_state.etags.get(url, (None, None))
+
+    itens = []
+    params = {"limit": 500}
+    headers = {"If-None-Match": etag} if etag else {}
+    while True:
+        response = cliente_http().get(url, params=params, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return itens_em_cache
+        if response.status_code != 200:
+            return itens
+        if "cursor" not in params:
+            etag = response.headers.get("ETag")
+        itens += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            if etag:
+                st.session_state.etags[url] = (etag, itens)
+            return itens
+        params["cursor"] = cursor
+        headers = {}
+
+
 @st.cache_data(ttl=5)
 def listar_eventos_registrados():
     try:
-        response = requests.get(f"{API_URL}/registered/", timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        return []
+        return buscar_todas_paginas(f"{API_URL}/registered/")
     except requests.exceptions.ConnectionError:
         st.error("📡 Erro de conexão: O servidor está demorando para responder.")
         return None
@@ -29,53 +85,70 @@ def listar_eventos_registrados():
 @st.cache_data(ttl=5)
 def listar_participantes_unicos():
     try:
-        response = requests.get(f"{API_URL}/participants/unique", timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        return []
+        return buscar_todas_paginas(f"{API_URL}/participants/unique")
     except Exception as e:
         st.error(f"Erro ao buscar participantes únicos: {e}")
         return []
 
 
-def criar_evento(nome_evento: str, nome_criador: str):
+def buscar_ideias(texto: str, limite: int = 50) -> dict[str, int]:
+    """Busca ideias pelo nome na API; devolve nome -> id."""
     try:
-        payload = {"event_name": nome_evento}
-        response = requests.post(f"{API_URL}/", json=payload, timeout=30)
-
+        response = cliente_http().get(
+            f"{API_URL}/search", params={"q": texto, "limit": limite}, timeout=10
+        )
         if response.status_code == 200:
-            evento = response.json()
-            event_id = evento["id_event"]
-
-            response_registered = requests.post(
-                f"{API_URL}/registered/",
-                params={
-                    "event_id": event_id,
-                    "event_name": nome_evento,
-                    "created_by": nome_criador,
-                },
-                timeout=30,
-            )
+            return {ideia["event_name"]: ideia["id_event"] for ideia in response.json()}
+    except Exception:
+        pass
+    return {}
 
-            if response_registered.status_code != 200:
-                return False, None
 
-            requests.post(
-                f"{API_URL}/{event_id}/participants",
-                json={"participant_name": nome_criador},
-                timeout=30,
-            )
+def buscar_ideias_parecidas(texto: str) -> list[str]:
+    """Busca ideias já sugeridas com nome parecido ao digitado."""
+    try:
+        response = cliente_http().get(
+            f"{API_URL}/similar", params={"q": texto, "k": 5}, timeout=5
+        )
+        if response.status_code == 200:
+            return [ideia["event_name"] for ideia in response.json()]
+    except Exception:
+        pass
+    return []
 
-            return True, event_id
-        else:
-            return False, None
+
+def criar_evento(nome_evento: str, nome_criador: str, outros_ids: list[int]):
+    """Cria a ideia, registra o criador e os votos extras numa única transação."""
+    try:
+        response = cliente_http().post(
+            f"{API_URL}/proposals",
+            json={
+                "event_name": nome_evento,
+                "created_by": nome_criador,
+                "event_ids": outros_ids,
+            },
+            timeout=30,
+        )
+        if response.status_code == 200:
+            proposta = response.json()
+            status_outros = {
+                resultado["id_event"]: STATUS_VOTOS.get(resultado["status"], "erro")
+                for resultado in proposta["votes"]["results"]
+            }
+            return True, proposta["event"]["id_event"], status_outros
     except Exception:
-        return False, None
+        pass
 
+    # A ideia não foi criada: os votos nas outras ideias seguem valendo
+    status_outros = registrar_votos(outros_ids, nome_criador) if outros_ids else {}
+    return False, None, status_outros
 
-def registrar_participante(event_id: int, nome: str):
+
+def registrar_participante(
+    event_id: int, nome: str, sessao: requests.Session | None = None
+):
     try:
-        response = requests.post(
+        response = (sessao or cliente_http()).post(
             f"{API_URL}/{event_id}/participants",
             json={"participant_name": nome},
             timeout=30,
@@ -84,21 +157,103 @@ def registrar_participante(event_id: int, nome: str):
             return "sucesso"
         elif response.status_code == 409:
             return "duplicado"
+        elif response.status_code == 404:
+            return "inexistente"
         else:
             return "erro"
     except Exception:
         return "erro"
 
 
-def check_api_health():
-    """Tenta acordar a API se estiver dormindo."""
+def registrar_votos(event_ids: list[int], nome: str) -> dict[int, str]:
+    """
+    Registra o voto de um participante em vários eventos numa única requisição.
+    Só quando a requisição não chega à API (falha de conexão) os votos são
+    reenviados um a um, em paralelo (limitado). Se a API responde com erro, os
+    votos ficam como "erro": repetir voto a voto não resolveria uma validação
+    recusada e só aumentaria a carga de uma API com falha. Se a resposta não
+    chega a tempo, o lote pode já ter sido gravado: os votos ficam "incerto".
+    """
     try:
-        response = requests.get(API_URL.replace("/eventos", "/"), timeout=5)  # noqa: F841
-        return True
-    except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
-        return False
+        response = cliente_http().post(
+            f"{API_URL}/votes",
+            json={"participant_name": nome, "event_ids": event_ids},
+            timeout=30,
+        )
+    except requests.exceptions.ConnectionError:  # inclui ConnectTimeout
+        return registrar_votos_individuais(event_ids, nome)
+    except requests.exceptions.ReadTimeout:
+        return {event_id: "incerto" for event_id in event_ids}
     except Exception:
-        return False
+        return {event_id: "erro" for event_id in event_ids}
+
+    if response.status_code == 200:
+        return {
+            resultado["id_event"]: STATUS_VOTOS.get(resultado["status"], "erro")
+            for resultado in response.json()["results"]
+        }
+
+    print(f"Log de Erro: POST /votes -> {response.status_code}: {response.text[:500]}")
+    return {event_id: "erro" for event_id in event_ids}
+
+
+def registrar_votos_individuais(event_ids: list[int], nome: str) -> dict[int, str]:
+    """Envia um voto por requisição, no máximo MAX_REQUISICOES_PARALELAS por vez."""
+    if not event_ids:
+        return {}
+    # A sessão é obtida aqui: as threads não têm o contexto do Streamlit
+    sessao = cliente_http()
+    with ThreadPoolExecutor(max_workers=MAX_REQUISICOES_PARALELAS) as executor:
+        status = executor.map(
+            lambda event_id: registrar_participante(event_id, nome, sessao), event_ids
+        )
+        return dict(zip(event_ids, status))
+
+
+def check_api_health() -> tuple[bool, str | None]:
+    """
+    Tenta acordar a API e verifica se o banco já está pronto (/readyz).
+    Devolve (pronta, erro): erro vem preenchido quando a API desistiu de
+    inicializar, caso em que não adianta continuar esperando.
+    """
+    try:
+        response = cliente_http().get(API_URL.replace("/eventos", "/readyz"), timeout=5)
+        if response.status_code == 200:
+            return True, None
+        estado = response.json()
+        return False, estado.get("error") if estado.get("fatal") else None
+    except Exception:
+        return False, None
+
+
+def registrar_na_sessao(
+    eventos_criados: dict[str, int] | None = None, participante: str | None = None
+) -> None:
+    """
+    Atualização otimista: guarda na sessão o que este usuário acabou de gravar,
+    para aparecer nas listas mesmo antes de a API devolver a versão nova.
+    Os participantes ficam indexados por normalizar_texto, a mesma chave da API.
+    """
+    st.session_state.setdefault("eventos_otimistas", {}).update(eventos_criados or {})
+    if participante and normalizar_texto(participante):
+        st.session_state.setdefault("participantes_otimistas", {})[
+            normalizar_texto(participante)
+        ] = participante.strip()
+
+
+def concluir_envio(mensagens: list[tuple[str, str]], gravou: bool) -> None:
+    """
+    Exibe as mensagens de um envio ((tipo, texto), tipo = success, warning...).
+    Se algo foi gravado, elas viram toasts exibidos após o st.rerun, que
+    recarrega as listas na hora, sem prender a thread do script.
+    """
+    if not gravou:
+        for tipo, texto in mensagens:
+            getattr(st, tipo)(texto)
+        return
+
+    st.session_state.avisos_pendentes = [texto for _, texto in mensagens]
+    st.rerun()
 
 
 # ==================== VERIFICAÇÃO DE SAÚDE DA API ====================
@@ -110,13 +265,21 @@ if not st.session_state.api_awake:
 
     with placeholder.container():
         with st.status("🚀 Acordando o servidor...", expanded=True) as status:
-            if check_api_health():
+            pronta, erro_fatal = check_api_health()
+            if pronta:
                 st.session_state.api_awake = True
                 status.update(
                     label="✅ Servidor Online!", state="complete", expanded=False
                 )
                 time.sleep(0.5)
                 placeholder.empty()
+            elif erro_fatal:
+                status.update(label="❌ Servidor indisponível", state="error")
+                st.error(
+                    "❌ O servidor não conseguiu iniciar. Avise os organizadores e tente novamente mais tarde."
+                )
+                print(f"Log de Erro: inicialização da API falhou: {erro_fatal}")
+                st.stop()
             else:
                 st.warning(
                     "😴 A API está em modo de espera. Isso pode levar até 30 segundos."
@@ -126,6 +289,10 @@ if not st.session_state.api_awake:
 
 # ==================== INTERFACE STREAMLIT ====================
 
+# Confirmações do último envio (ver concluir_envio)
+for aviso in st.session_state.pop("avisos_pendentes", []):
+    st.toast(aviso, duration="long")
+
 # Carrega dados para os selects
 eventos = listar_eventos_registrados()
 
@@ -133,6 +300,14 @@ if not isinstance(eventos, list):
     eventos = []
 
 eventos_map = {e["event_name"]: e["id_event"] for e in eventos}
+# Eventos otimistas que a API já devolve saem da sessão
+eventos_otimistas = st.session_state.get("eventos_otimistas", {})
+ids_listados = set(eventos_map.values())
+for ev_nome, ev_id in list(eventos_otimistas.items()):
+    if ev_id in ids_listados:
+        del eventos_otimistas[ev_nome]
+    else:
+        eventos_map.setdefault(ev_nome, ev_id)
 
 # -------------------- COLUNA - CRIAR --------------------
 st.subheader("➕ Criar Nova Ideia de Evento")
@@ -148,6 +323,15 @@ nome_novo_evento = st.text_input(
     help="Para manter a votação organizada, envie uma ideia de cada vez.",
 )
 
+if nome_novo_evento.strip():
+    ideias_parecidas = buscar_ideias_parecidas(nome_novo_evento)
+    if ideias_parecidas:
+        st.info(
+            "💡 Ideias parecidas já foram sugeridas: **"
+            + ", ".join(ideias_parecidas)
+            + "**. Se for a mesma ideia, vote nela em vez de criar outra!"
+        )
+
 outros_eventos = st.multiselect(
     "🎉 Aproveite para votar em outras ideias já sugeridas! (opcional)",
     options=list(eventos_map.keys()),
@@ -167,44 +351,72 @@ if st.button("🚀 Criar Ideia de Evento e Votar", width="stretch"):
             "Para **apenas votar** em ideias já sugeridas, utilize a seção logo abaixo: **🗳️ Votar em Ideias de Eventos**."
         )
     else:
-        sucesso_criacao, id_novo = criar_evento(nome_novo_evento, nome_criador)
+        sucesso_criacao, id_novo, status_outros = criar_evento(
+            nome_novo_evento,
+            nome_criador,
+            [eventos_map[ev] for ev in outros_eventos],
+        )
 
         votos_ad_sucesso = []
         votos_ad_duplicados = []
 
         for ev_nome in outros_eventos:
-            status = registrar_participante(eventos_map[ev_nome], nome_criador)
+            status = status_outros.get(eventos_map[ev_nome], "erro")
             if status == "sucesso":
                 votos_ad_sucesso.append(ev_nome)
             elif status == "duplicado":
                 votos_ad_duplicados.append(ev_nome)
 
+        mensagens = []
         if not sucesso_criacao:
-            st.error(
-                f"❌ {nome_criador}, a ideia **{nome_novo_evento}** já foi sugerida por outro jovem. Para votar nesta ideia utilize a seção logo abaixo: **🗳️ Votar em Ideias de Eventos**!"
+            mensagens.append(
+                (
+                    "error",
+                    f"❌ {nome_criador}, a ideia **{nome_novo_evento}** já foi sugerida por outro jovem. Para votar nesta ideia utilize a seção logo abaixo: **🗳️ Votar em Ideias de Eventos**!",
+                )
             )
-            st.info(
-                f"💡 Que tal tentar propor uma ideia diferente de **{nome_novo_evento}**?"
+            mensagens.append(
+                (
+                    "info",
+                    f"💡 Que tal tentar propor uma ideia diferente de **{nome_novo_evento}**?",
+                )
             )
         else:
-            st.success(
-                f"✅ {nome_criador}, ideia **{nome_novo_evento}** foi registrada com sucesso. Obrigado por sua contribuição!"
+            mensagens.append(
+                (
+                    "success",
+                    f"✅ {nome_criador}, ideia **{nome_novo_evento}** foi registrada com sucesso. Obrigado por sua contribuição!",
+                )
             )
 
         if votos_ad_duplicados:
             lista_dup = ", ".join(votos_ad_duplicados)
-            st.warning(
-                f"⚠️ Você já tinha votado em: **{lista_dup}**. Esses votos não foram repetidos."
+            mensagens.append(
+                (
+                    "warning",
+                    f"⚠️ Você já tinha votado em: **{lista_dup}**. Esses votos não foram repetidos.",
+                )
             )
 
         if votos_ad_sucesso:
             lista_suc = ", ".join(votos_ad_sucesso)
-            st.success(f"🎉 {nome_criador}, voto(s) registrado(s) em: **{lista_suc}**!")
+            mensagens.append(
+                (
+                    "success",
+                    f"🎉 {nome_criador}, voto(s) registrado(s) em: **{lista_suc}**!",
+                )
+            )
+
+        if sucesso_criacao:
+            # A nova ideia e o criador mudam as duas listas
+            listar_eventos_registrados.clear()
+            listar_participantes_unicos.clear()
+            registrar_na_sessao({nome_novo_evento.strip(): id_novo}, nome_criador)
+        elif votos_ad_sucesso:
+            listar_participantes_unicos.clear()
+            registrar_na_sessao(participante=nome_criador)
 
-        if sucesso_criacao or votos_ad_sucesso:
-            st.cache_data.clear()
-            time.sleep(10)
-            st.rerun()
+        concluir_envio(mensagens, sucesso_criacao or bool(votos_ad_sucesso))
 
 # -------------------- COLUNA VOTAR -------------------
 st.divider()
@@ -216,9 +428,21 @@ nome_votante = st.text_input(
     "👤 Seu nome", placeholder="Digite seu nome completo", key="nome_votante"
 )
 
+busca_voto = st.text_input(
+    "🔎 Buscar ideia", placeholder="ex: boliche, pizza...", key="busca_voto"
+)
+if busca_voto.strip():
+    # Mantém as ideias já selecionadas entre as opções para não perder a seleção
+    opcoes_voto = buscar_ideias(busca_voto)
+    for ev_nome in st.session_state.get("eventos_selecionados", []):
+        if ev_nome in eventos_map:
+            opcoes_voto.setdefault(ev_nome, eventos_map[ev_nome])
+else:
+    opcoes_voto = eventos_map
+
 eventos_selecionados = st.multiselect(
     "🎉 Selecione as ideias ideias já sugeridas que deseja votar",
-    options=list(eventos_map.keys()),
+    options=list(opcoes_voto.keys()),
     placeholder="Clique aqui e escolha quantas quiser",
     key="eventos_selecionados",
 )
@@ -231,48 +455,89 @@ if st.button("✅ Confirmar Voto", width="stretch"):
     else:
         votos_com_sucesso = []
         votos_duplicados = []
+        votos_incertos = []
         erros_tecnicos = []
 
+        status_votos = registrar_votos(
+            [opcoes_voto[ev] for ev in eventos_selecionados], nome_votante
+        )
         for ev_nome in eventos_selecionados:
-            status = registrar_participante(eventos_map[ev_nome], nome_votante)
+            status = status_votos.get(opcoes_voto[ev_nome], "erro")
             if status == "sucesso":
                 votos_com_sucesso.append(ev_nome)
             elif status == "duplicado":
                 votos_duplicados.append(ev_nome)
+            elif status == "incerto":
+                votos_incertos.append(ev_nome)
             else:
                 erros_tecnicos.append(f"{ev_nome} ({status})")
 
+        mensagens = []
         if votos_duplicados:
             lista_dup = ", ".join(votos_duplicados)
-            st.warning(
-                f"⚠️ **{nome_votante}**, você já tinha votado em: **{lista_dup}**. Esses votos não foram repetidos."
+            mensagens.append(
+                (
+                    "warning",
+                    f"⚠️ **{nome_votante}**, você já tinha votado em: **{lista_dup}**. Esses votos não foram repetidos.",
+                )
             )
 
+        if votos_incertos:
+            lista_inc = ", ".join(votos_incertos)
+            mensagens.append(
+                (
+                    "warning",
+                    f"⏳ **{nome_votante}**, a API demorou a responder e não conseguimos confirmar seus votos em: **{lista_inc}**. Eles podem ter sido registrados: confira a lista de participantes antes de votar de novo.",
+                )
+            )
+            # Busca a lista de novo para mostrar o que de fato foi gravado
+            listar_participantes_unicos.clear()
+
         if erros_tecnicos:
-            st.error(
-                "❌ Ops! Tivemos um problema técnico ao registrar alguns de seus votos. Por favor, tente novamente."
+            mensagens.append(
+                (
+                    "error",
+                    "❌ Ops! Tivemos um problema técnico ao registrar alguns de seus votos. Por favor, tente novamente.",
+                )
             )
             for erro in erros_tecnicos:
                 print(f"Log de Erro: {erro}")
 
         if votos_com_sucesso:
             lista_suc = ", ".join(votos_com_sucesso)
-            st.success(
-                f"✅ **{nome_votante}**, voto(s) registrado(s) com sucesso para: **{lista_suc}**. Obrigado por sua contribuição!"
+            mensagens.append(
+                (
+                    "success",
+                    f"✅ **{nome_votante}**, voto(s) registrado(s) com sucesso para: **{lista_suc}**. Obrigado por sua contribuição!",
+                )
             )
-            st.cache_data.clear()
-            time.sleep(10)
-            st.rerun()
+            # Votos não mudam a lista de ideias, só a de participantes
+            listar_participantes_unicos.clear()
+            registrar_na_sessao(participante=nome_votante)
 
         elif votos_duplicados:
-            st.info(
-                "💡 Como você já votou nessas ideias, que tal propor uma nova na seção logo acima: **➕ Criar Nova Ideia de Evento**?"
+            mensagens.append(
+                (
+                    "info",
+                    "💡 Como você já votou nessas ideias, que tal propor uma nova na seção logo acima: **➕ Criar Nova Ideia de Evento**?",
+                )
             )
 
+        concluir_envio(mensagens, bool(votos_com_sucesso))
+
 # -------------------- TABELA DE PARTICIPANTES --------------------
 st.divider()
 st.subheader("👥 Participantes que já contribuíram")
-participantes = listar_participantes_unicos()
+participantes = listar_participantes_unicos() or []
+
+# Inclui quem acabou de contribuir nesta sessão, caso a lista ainda não o traga;
+# quem a lista já traz sai da sessão
+participantes_otimistas = st.session_state.get("participantes_otimistas", {})
+for chave in {normalizar_texto(p["participant_name"]) for p in participantes}:
+    participantes_otimistas.pop(chave, None)
+participantes = participantes + [
+    {"participant_name": nome} for nome in sorted(participantes_otimistas.values())
+]
 
 if participantes:
     df = pd.DataFrame(participantes)
@@ -4,10 +4,9 @@ import unicodedata
 
 # Função para normalizar o texto
 def normalizar_texto(texto):
-    texto = str(texto).lower()
-    texto = (
-        unicodedata.normalize("NFKD", texto).encode("ASCII", "ignore").decode("utf-8")
-    )  # Remove acentos
+    texto = unicodedata.normalize("NFKD", str(texto).casefold())
+    # Remove só os acentos (marcas combinantes): letras de outros alfabetos ficam
+    texto = "".join(ch for ch in texto if not unicodedata.combining(ch))
     texto = re.sub(r"\s+", " ", texto)  # Substitui múltiplos espaços por um só
     texto = texto.strip()
     return texto